@@ -29,6 +29,37 @@ _SECRET_PATTERNS = [
 
 _TLD_PATTERN = r"(com|net|org|io|ai|app|dev|edu|gov|co|uk|au)"
 
+# Phonetic/alias corrections applied to the raw transcript before planning.
+# Resolving these locally means the planner LLM never has to reason about
+# trivial alias work. Only unambiguous mishearings belong here - words that
+# are also ordinary English ("male", "massage", "you to") stay in the
+# planner prompt's correction tables, where the LLM applies them in context.
+_PHONETIC_ALIASES = {
+    "crome": "Chrome",
+    "discourt": "Discord",
+    "spot a fly": "Spotify",
+    "finer": "Finder",
+    "vs code": "Visual Studio Code",
+    "vscode": "Visual Studio Code",
+}
+
+# Longest phrases first so multi-word aliases win over their substrings,
+# compiled once into a single alternation for a one-pass rewrite.
+_ALIAS_PATTERN = re.compile(
+    r"\b(" + "|".join(
+        re.escape(k) for k in sorted(_PHONETIC_ALIASES, key=len, reverse=True)
+    ) + r")\b",
+    re.IGNORECASE,
+)
+
+
+def normalize_aliases(text: str) -> str:
+    """Rewrite known phonetic mishearings and app aliases in a transcript."""
+    if not text:
+        return text
+    return _ALIAS_PATTERN.sub(lambda m: _PHONETIC_ALIASES[m.group(1).lower()], text)
+
+
 # Common app aliases for fuzzy matching
 APP_ALIASES = {
     "google chrome": ["chrome"],
@@ -83,7 +83,7 @@ def fail(error: str) -> Outcome[T]:
 # DOMAIN ENTITIES
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ActionStep:
     """A single executable action with its intent and arguments."""
     intent: Intent
@@ -94,7 +94,7 @@ class ActionStep:
         return (self.args or {}).get(key, default)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Command:
     """Represents a user command with its raw text and planned steps."""
     raw: str        
@@ -102,7 +102,7 @@ class Command:
     steps: List[ActionStep] = field(default_factory=list)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Result:
     """
     Simple result for skill handlers (backward compatible).
@@ -1,4 +1,6 @@
-import json, os, re
+import os, re
+
+import orjson
 from typing import Any, Dict, Generator
 from openai import OpenAI
 
@@ -47,6 +49,10 @@ Functional Rules:
 - only save what user tells you do not save anything else 
 """
 
+# Prebuilt once so every request reuses the same system message object
+# (byte-identical prompt prefix also keeps API-side prompt caching warm).
+_SYSTEM_MESSAGE = {"role": "system", "content": NARRATOR_PROMPT}
+
 
 def narrate_turn(user_text: str, tool_bundle: Dict[str, Any]) -> str:
     """Non-streaming narrator - returns full response."""
@@ -62,8 +68,8 @@ def narrate_turn(user_text: str, tool_bundle: Dict[str, Any]) -> str:
         temperature=0.7,
         max_tokens=LLM_MAX_TOKENS,  # Limit for speed
         messages=[
-            {"role": "system", "content": NARRATOR_PROMPT},
-            {"role": "user", "content": f"USER:\n{user_text}\n\nTOOL_RESULTS:\n{json.dumps(tool_bundle, ensure_ascii=False)}"},
+            _SYSTEM_MESSAGE,
+            {"role": "user", "content": f"USER:\n{user_text}\n\nTOOL_RESULTS:\n{orjson.dumps(tool_bundle).decode()}"},
         ],
     )
     return (resp.choices[0].message.content or "").strip() or "…"
@@ -86,8 +92,8 @@ def narrate_turn_streaming(user_text: str, tool_bundle: Dict[str, Any]) -> Gener
         temperature=0.7,
         stream=True,  # Enable streaming
         messages=[
-            {"role": "system", "content": NARRATOR_PROMPT},
-            {"role": "user", "content": f"USER:\n{user_text}\n\nTOOL_RESULTS:\n{json.dumps(tool_bundle, ensure_ascii=False)}"},
+            _SYSTEM_MESSAGE,
+            {"role": "user", "content": f"USER:\n{user_text}\n\nTOOL_RESULTS:\n{orjson.dumps(tool_bundle).decode()}"},
         ],
     )
     
@@ -12,6 +12,7 @@ This is the "Application Layer" orchestrator that coordinates all components.
 """
 from __future__ import annotations
 
+import asyncio
 import os
 import re
 import sys
@@ -23,7 +24,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from core.models import ActionStep, Command, Result
 from core.intent import Intent
 from core.safety import check_command, SafetyDecision
-from core.planner import plan_turn, TurnPlan
+from core.planner import canonical_context, plan_turn_async, TurnPlan
 from core.narrator import narrate_turn, narrate_turn_streaming
 
 # Supermemory integration for graph-based AI memory
@@ -164,15 +165,17 @@ class NexusOrchestrator:
             speak_text("Restarting myself now.")
             os.execv(sys.executable, ['python'] + sys.argv)
         
-        # Log user event
-        user_event = await self.mcp.call("pg_append_event", {
+        # Log the user event concurrently with planning - the planner doesn't
+        # need the event id, so there's no reason to pay the DB round-trip
+        # before the LLM call starts. Only _handle_memory_ops needs the id,
+        # and that runs after the plan is back.
+        log_task = asyncio.create_task(self.mcp.call("pg_append_event", {
             "kind": "user_msg",
             "payload": {"text": redact(raw)},
             "session_id": self.session_id,
             "tags": ["user"],
-        })
-        user_event_id = user_event.get("event_id")
-        
+        }))
+
         # Plan the turn
         app_list = get_running_apps()
         history_text = "\n".join(self.chat_history[-4:])
@@ -186,13 +189,18 @@ class NexusOrchestrator:
             import threading
             threading.Thread(target=speak_text, args=(text,), daemon=True).start()
 
-        plan = plan_turn(
+        # Await the async planner so the event loop stays free during the
+        # network round-trip instead of blocking on the sync client.
+        plan = await plan_turn_async(
             raw,
             history=history_text,
-            context=f"Running Apps: {', '.join(app_list)}",
+            context=canonical_context(app_list),
             on_speak=on_speak_cb
         )
         
+        user_event = await log_task
+        user_event_id = user_event.get("event_id")
+
         # Apply deterministic overrides
         plan = self._apply_overrides(plan, raw, app_list)
         
@@ -1,35 +1,48 @@
 # core/planner.py
 from __future__ import annotations
 
-import json
 import os
+import re
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Final, Iterable, List, Optional
 
-from openai import OpenAI
+import fastjsonschema
+import httpx
+import orjson
+from openai import AsyncOpenAI, OpenAI
 
+from core.helpers import normalize_aliases
 from core.intent import Intent
 from core.models import ActionStep
+from core.ratelimit import RateLimiter
 
 
 # ----------------------------
 # TurnPlan schema
 # ----------------------------
 
-@dataclass
+# slots=True drops the per-instance __dict__ (these are built on every turn)
+# and frozen=True rules out aliasing bugs with the response cache, which
+# hands out shared MemoryRead/MemoryWrite references across cache hits.
+
+@dataclass(slots=True, frozen=True)
 class MemoryRead:
     query: str
     limit: int = 5
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MemoryWrite:
     should_store: bool
     confidence: float = 0.0
     note: Optional[dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TurnPlan:
     actions: List[ActionStep]
     memory_read: Optional[MemoryRead] = None
@@ -38,6 +51,13 @@ class TurnPlan:
 
 
 _client: OpenAI | None = None
+_aclient: AsyncOpenAI | None = None
+
+# System prompt is static - load it once and freeze the message dict so the
+# same str object (and its cached UTF-8 encoding) is reused on every request.
+_PROMPT_FILE = Path(__file__).parent.parent / "prompts" / "planner_prompt.txt"
+_SYSTEM_PROMPT: Final[str] = _PROMPT_FILE.read_text(encoding="utf-8")
+_SYSTEM_MESSAGE: Final[dict] = {"role": "system", "content": _SYSTEM_PROMPT}
 
 # LLM Provider: "openai" (API, fast) or "local" (LM Studio)
 LLM_PROVIDER = os.getenv("NEXUS_LLM_PROVIDER", "local")  # Using local LM Studio
@@ -46,14 +66,34 @@ LLM_LOCAL_MODEL = os.getenv("NEXUS_LLM_LOCAL_MODEL", "qwen/qwen3-vl-8b")
 LLM_MAX_TOKENS = int(os.getenv("NEXUS_LLM_MAX_TOKENS", "256"))  # Limit tokens for speed
 
 
+# Connection-pool tuning shared by both clients. A 3s connect budget fails
+# fast on network trouble, and a persistent keep-alive pool means only the
+# very first turn pays the TCP+TLS handshake; HTTP/2 additionally lets the
+# async/batch variants multiplex concurrent requests on one connection.
+_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=16,
+    max_connections=32,
+    keepalive_expiry=300,  # idle connections survive pauses between turns
+)
+_HTTP_TIMEOUT = httpx.Timeout(20.0, connect=3.0)
+
+# Shared pacing for API-bound requests (async path); see core/ratelimit.py
+_RATE_LIMITER = RateLimiter(
+    rpm=int(os.getenv("NEXUS_OPENAI_RPM", "300")),
+    max_concurrent=int(os.getenv("NEXUS_OPENAI_MAX_CONCURRENT", "8")),
+)
+
+
 def _get_client() -> OpenAI:
     global _client
     if _client is None:
+        http_client = httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
         if LLM_PROVIDER == "local":
             # LM Studio - OpenAI-compatible local API
             _client = OpenAI(
                 base_url=LLM_LOCAL_BASE,
-                api_key="lm-studio"  # LM Studio doesn't need real API key
+                api_key="lm-studio",  # LM Studio doesn't need real API key
+                http_client=http_client,
             )
             print(f"[NEXUS] Using local LLM: {LLM_LOCAL_MODEL}")
         else:
@@ -61,56 +101,151 @@ def _get_client() -> OpenAI:
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise RuntimeError("OPENAI_API_KEY is not set")
-            _client = OpenAI(api_key=api_key)
+            # One retry (not the default two) since plan_turn already
+            # fails soft on a bad response, and a 20s timeout so a stuck
+            # request can't block a voice turn. Cross-turn stickiness
+            # comes from prompt_cache_key on the requests themselves.
+            _client = OpenAI(
+                api_key=api_key,
+                max_retries=1,
+                http_client=http_client,
+            )
     return _client
 
 
+def _get_aclient() -> AsyncOpenAI:
+    global _aclient
+    if _aclient is None:
+        http_client = httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        if LLM_PROVIDER == "local":
+            _aclient = AsyncOpenAI(
+                base_url=LLM_LOCAL_BASE,
+                api_key="lm-studio",
+                http_client=http_client,
+            )
+        else:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise RuntimeError("OPENAI_API_KEY is not set")
+            _aclient = AsyncOpenAI(
+                api_key=api_key,
+                max_retries=1,
+                http_client=http_client,
+            )
+    return _aclient
+
+
 # ----------------------------
 # Strict validation helpers
 # ----------------------------
 
-def _validate_turn_plan_dict(d: Any) -> bool:
-    if not isinstance(d, dict):
-        return False
-
-    # response_text (optional but recommended)
-    if "response_text" in d and not isinstance(d["response_text"], str):
-        return False
-
-    # actions
-    actions = d.get("actions")
-    if actions is None or not isinstance(actions, list):
-        return False
-    for a in actions:
-        if not isinstance(a, dict) or "intent" not in a:
-            return False
-        if "args" in a and a["args"] is not None and not isinstance(a["args"], dict):
-            return False
-
-    # memory_read
-    mr = d.get("memory_read")
-    if mr is not None:
-        if not isinstance(mr, dict):
-            return False
-        if not isinstance(mr.get("query"), str) or not mr["query"].strip():
-            return False
-
-    # memory_write
-    mw = d.get("memory_write")
-    if mw is not None:
-        if not isinstance(mw, dict):
-            return False
-        if "should_store" not in mw or not isinstance(mw["should_store"], bool):
-            return False
-        if mw.get("should_store"):
-            note = mw.get("note")
-            if note is None or not isinstance(note, dict):
-                return False
-            content = note.get("content")
-            if not isinstance(content, str) or not content.strip():
-                return False
-
-    return True
+# Schema for the planner's JSON output; compiled once at import into a
+# single linear validation function (much faster than hand-rolled checks).
+_TURN_PLAN_SCHEMA: Final[dict] = {
+    "type": "object",
+    "required": ["actions"],
+    "properties": {
+        "response_text": {"type": "string"},
+        "actions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["intent"],
+                "properties": {
+                    "intent": {"type": "string"},
+                    "args": {"type": ["object", "null"]},
+                },
+            },
+        },
+        "memory_read": {
+            "type": ["object", "null"],
+            "required": ["query"],
+            "properties": {
+                "query": {"type": "string", "minLength": 1},
+                "limit": {"type": ["integer", "null"]},
+            },
+        },
+        "memory_write": {
+            "type": ["object", "null"],
+            "required": ["should_store"],
+            "properties": {
+                "should_store": {"type": "boolean"},
+                "confidence": {"type": ["number", "null"]},
+                "note": {"type": ["object", "null"]},
+            },
+            "if": {"properties": {"should_store": {"const": True}}},
+            "then": {
+                "required": ["should_store", "note"],
+                "properties": {
+                    "note": {
+                        "type": "object",
+                        "required": ["content"],
+                        "properties": {"content": {"type": "string", "minLength": 1}},
+                    },
+                },
+            },
+        },
+    },
+}
+
+_validate_turn_plan = fastjsonschema.compile(_TURN_PLAN_SCHEMA)
+
+
+def _parse_turn_plan(data: Any, response_text: str = "") -> Optional[TurnPlan]:
+    """
+    Validate and construct a TurnPlan from decoded model JSON in one pass.
+    The compiled schema check runs first; each field is then built exactly
+    once, failing soft to None on malformed sub-structures. Returns None
+    when the payload as a whole is unusable (caller can escalate).
+    """
+    try:
+        _validate_turn_plan(data)
+    except fastjsonschema.JsonSchemaException:
+        return None
+
+    actions = _coerce_action_steps(data["actions"])
+
+    memory_read: Optional[MemoryRead] = None
+    mr = data.get("memory_read")
+    if isinstance(mr, dict):
+        try:
+            memory_read = MemoryRead(query=str(mr.get("query", "")), limit=int(mr.get("limit") or 5))
+        except (TypeError, ValueError):
+            memory_read = None
+
+    memory_write: Optional[MemoryWrite] = None
+    mw = data.get("memory_write")
+    if isinstance(mw, dict):
+        should_store = bool(mw.get("should_store"))
+        try:
+            memory_write = MemoryWrite(
+                should_store=should_store,
+                confidence=float(mw.get("confidence") or 0.0),
+                note=mw.get("note") if should_store else None,
+            )
+        except (TypeError, ValueError):
+            memory_write = None
+
+    if not response_text:
+        response_text = str(data.get("response_text", "")).strip()
+
+    return TurnPlan(
+        response_text=response_text,
+        memory_read=memory_read,
+        memory_write=memory_write,
+        actions=actions,
+    )
+
+
+# Snapshot of Intent.__members__ as a plain dict: one .get per step instead
+# of a membership test plus an enum __getitem__. Matters in batch/eval mode
+# where coercion runs thousands of times. Lowercase spellings are included
+# so well-formed output (models emit either case consistently) resolves
+# without a per-step Unicode case-map; only odd mixed case pays .upper().
+_INTENT_LOOKUP: Final[dict[str, Intent]] = {
+    **Intent.__members__,
+    **{name.lower(): member for name, member in Intent.__members__.items()},
+}
 
 
 def _coerce_action_steps(actions_raw: list[Any]) -> list[ActionStep]:
@@ -118,8 +253,11 @@ def _coerce_action_steps(actions_raw: list[Any]) -> list[ActionStep]:
     for s in actions_raw:
         if not isinstance(s, dict):
             continue
-        intent_name = str(s.get("intent", "")).upper()
-        intent = Intent[intent_name] if intent_name in Intent.__members__ else Intent.UNKNOWN
+        intent_name = str(s.get("intent", ""))
+        intent = (
+            _INTENT_LOOKUP.get(intent_name)
+            or _INTENT_LOOKUP.get(intent_name.upper(), Intent.UNKNOWN)
+        )
         args = s.get("args")
         if not isinstance(args, dict):
             args = {}
@@ -132,50 +270,598 @@ def _coerce_action_steps(actions_raw: list[Any]) -> list[ActionStep]:
     return steps
 
 
+# ----------------------------
+# Deterministic fast path
+# ----------------------------
+
+# A large share of voice traffic is trivially classifiable ("open Chrome",
+# "close Slack", "bye") and doesn't need an LLM round-trip at all. These
+# compiled patterns resolve such turns in microseconds instead of hundreds
+# of milliseconds. Deliberately narrow: anything referential ("close it"),
+# multi-app, or ambiguous falls through to the planner.
+_FAST_EXIT_RE = re.compile(r"^(?:bye|goodbye|later|i'?m done|that'?s all)[.!]?$", re.IGNORECASE)
+_FAST_OPEN_RE = re.compile(r"^(?:open|launch|start)\s+(?P<app>[a-z0-9 ]{2,40})$", re.IGNORECASE)
+_FAST_CLOSE_RE = re.compile(r"^(?:close|quit)\s+(?P<app>[a-z0-9 ]{2,40})$", re.IGNORECASE)
+# No bare "google" trigger: "google chrome" is an app, not a query.
+_FAST_SEARCH_RE = re.compile(r"^(?:search(?: the web)?(?: for)?|look up)\s+(?P<query>.{2,120})$", re.IGNORECASE)
+_FAST_NOTE_RE = re.compile(r"^(?:note that|take a note|write a note)[:,]?\s+(?P<content>.{2,400})$", re.IGNORECASE)
+
+# App captures that actually need context or history to resolve
+_FAST_SKIP_WORDS = frozenset({
+    "it", "that", "this", "them", "everything", "all", "all apps",
+    "all the apps", "up", "down",
+})
+
+# Trailing politeness voice users tack onto commands ("close slack please");
+# stripped from the capture so it doesn't become part of the app name.
+_FAST_COURTESY_RE = re.compile(
+    r"(?:\s*\b(?:please|now|for me|thanks|thank you))+$", re.IGNORECASE
+)
+
+
+def _fast_path_plan(user_text: str) -> Optional[TurnPlan]:
+    """Classify a trivial utterance without the LLM, or return None."""
+    text = normalize_aliases(user_text).strip().rstrip(".!?").strip()
+
+    if _FAST_EXIT_RE.match(text):
+        return TurnPlan(
+            actions=[ActionStep(intent=Intent.EXIT, args={})],
+            response_text="Goodbye for now.",
+        )
+
+    for pattern, intent, verb in (
+        (_FAST_OPEN_RE, Intent.OPEN_APP, "Opening"),
+        (_FAST_CLOSE_RE, Intent.CLOSE_APP, "Closing"),
+    ):
+        m = pattern.match(text)
+        if not m:
+            continue
+        app = _FAST_COURTESY_RE.sub("", m.group("app")).strip()
+        if not app or app.lower() in _FAST_SKIP_WORDS or " and " in app.lower():
+            return None
+        app = app if app[0].isupper() else app.title()
+        return TurnPlan(
+            actions=[ActionStep(intent=intent, args={"app_name": app})],
+            response_text=f"{verb} {app}.",
+        )
+
+    m = _FAST_SEARCH_RE.match(text)
+    if m:
+        query = m.group("query").strip()
+        if query.lower() in _FAST_SKIP_WORDS:
+            return None
+        return TurnPlan(
+            actions=[ActionStep(intent=Intent.SEARCH_WEB, args={"query": query})],
+            response_text=f"Searching the web for {query}.",
+        )
+
+    m = _FAST_NOTE_RE.match(text)
+    if m:
+        content = m.group("content").strip()
+        return TurnPlan(
+            actions=[ActionStep(intent=Intent.CREATE_NOTE, args={"content": content})],
+            response_text="Noted.",
+        )
+
+    return None
+
+
+# ----------------------------
+# Response cache
+# ----------------------------
+
+# Repeated identical voice commands ("open Chrome" twice in a row) skip the
+# network round-trip entirely. Keyed by (normalized text, history, context,
+# provider); entries expire after a short TTL so stale plans don't outlive
+# the conversation state they were made for.
+_PLAN_CACHE: "OrderedDict[tuple, tuple[TurnPlan, float]]" = OrderedDict()
+_PLAN_CACHE_MAX = 256
+_PLAN_CACHE_TTL = float(os.getenv("NEXUS_PLAN_CACHE_TTL", "300"))
+
+
+def _plan_cache_get(key: tuple) -> Optional[TurnPlan]:
+    entry = _PLAN_CACHE.get(key)
+    if entry is None:
+        return None
+    plan, ts = entry
+    if time.monotonic() - ts > _PLAN_CACHE_TTL:
+        del _PLAN_CACHE[key]
+        return None
+    _PLAN_CACHE.move_to_end(key)
+    # Fresh actions list so downstream mutation can't poison the cache
+    return TurnPlan(
+        actions=list(plan.actions),
+        memory_read=plan.memory_read,
+        memory_write=plan.memory_write,
+        response_text=plan.response_text,
+    )
+
+
+def _cacheable(plan: TurnPlan) -> bool:
+    """A plan with UNKNOWN steps isn't worth replaying on a repeat turn."""
+    return not any(st.intent == Intent.UNKNOWN for st in plan.actions)
+
+
+def _plan_cache_put(key: tuple, plan: TurnPlan) -> None:
+    _PLAN_CACHE[key] = (plan, time.monotonic())
+    _PLAN_CACHE.move_to_end(key)
+    while len(_PLAN_CACHE) > _PLAN_CACHE_MAX:
+        _PLAN_CACHE.popitem(last=False)
+
+
+# ----------------------------
+# Semantic near-duplicate cache
+# ----------------------------
+
+# ASR jitters phrasing ("open chrome please" vs "open Chrome"), so the
+# exact-match cache misses turns that mean the same thing. This cache
+# embeds the utterance with a small local model and reuses the plan of the
+# cosine-nearest prior utterance above a high threshold. Opt-in via
+# NEXUS_SEM_CACHE=1 because the encoder costs ~90MB of RAM; only consulted
+# for history-free, context-free turns so a reused plan can't be stale.
+_SEM_CACHE_MAX = 512
+_SEM_THRESHOLD = float(os.getenv("NEXUS_SEM_CACHE_THRESHOLD", "0.95"))
+_sem_encoder = None
+_sem_matrix = None  # (N, dim) float32, rows are normalized embeddings
+_sem_plans: list[TurnPlan] = []
+_sem_next = 0  # ring-buffer write index once full
+
+
+def _sem_enabled() -> bool:
+    return bool(os.getenv("NEXUS_SEM_CACHE"))
+
+
+def _sem_encode(user_text: str):
+    global _sem_encoder
+    if _sem_encoder is None:
+        from sentence_transformers import SentenceTransformer
+        _sem_encoder = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+    return _sem_encoder.encode(user_text, normalize_embeddings=True)
+
+
+def _semantic_cache_get(user_text: str):
+    """Return (vec, plan-or-None); vec is reused for the later store."""
+    vec = _sem_encode(normalize_aliases(user_text).strip().lower())
+    if not _sem_plans:
+        return vec, None
+    sims = _sem_matrix[: len(_sem_plans)] @ vec  # one SGEMV
+    i = int(sims.argmax())
+    if sims[i] < _SEM_THRESHOLD:
+        return vec, None
+    plan = _sem_plans[i]
+    return vec, TurnPlan(
+        actions=list(plan.actions),
+        memory_read=plan.memory_read,
+        memory_write=plan.memory_write,
+        response_text=plan.response_text,
+    )
+
+
+def _semantic_cache_put(vec, plan: TurnPlan) -> None:
+    global _sem_matrix, _sem_next
+    import numpy as np
+    if _sem_matrix is None:
+        _sem_matrix = np.zeros((_SEM_CACHE_MAX, vec.shape[0]), dtype=np.float32)
+    if len(_sem_plans) < _SEM_CACHE_MAX:
+        _sem_matrix[len(_sem_plans)] = vec
+        _sem_plans.append(plan)
+    else:
+        _sem_matrix[_sem_next] = vec
+        _sem_plans[_sem_next] = plan
+        _sem_next = (_sem_next + 1) % _SEM_CACHE_MAX
+
+
 # ----------------------------
 # Combined planner
 # ----------------------------
 
 
+def canonical_context(apps: Iterable[str]) -> str:
+    """
+    Deterministic running-apps context string. Prompt caching (both the
+    API-side prefix cache and the local plan caches) needs byte-identical
+    input across turns, so the app list is deduped and sorted - launch
+    order must not change the bytes. Callers must likewise keep
+    timestamps/PIDs out of context strings.
+    """
+    return "Running Apps: " + ", ".join(sorted(set(apps)))
+
+
+# Stripped to match: plan_turn canonicalizes context with .strip() before
+# any comparison, and canonical_context(()) carries a trailing space.
+_EMPTY_CONTEXT = canonical_context(()).strip()
+
+
+def _sem_cache_applicable(history: str, context: str) -> bool:
+    """True when the turn carries no state a cached plan could depend on.
+
+    The orchestrator always passes canonical_context(app_list), which is
+    a non-empty string even with zero running apps - treat that form as
+    empty too, or the semantic cache could never serve the live path.
+    Both arguments are expected pre-stripped (plan_turn does this).
+    """
+    return not history and (not context or context == _EMPTY_CONTEXT)
+
+
 def plan_turn(user_text: str, history: str = "", context: str = "", on_speak: Optional[Callable[[str], None]] = None) -> TurnPlan:
     """
     Decodes voice commands using LLM phonetic reasoning with streaming.
     Detects 'SPEAK: "..."' line early to trigger TTS.
+
+    Repeated identical turns (same utterance, history and context) are
+    served from a small in-process TTL cache without touching the API.
+    On the OpenAI provider this runs a two-tier strategy: the cheap model
+    handles every turn first, and only invalid/UNKNOWN plans escalate to
+    the strong model.
+    """
+    # Canonical forms maximize cache hits (leading/trailing whitespace in
+    # history must not produce a distinct prompt prefix or cache key).
+    history = history.strip()
+    context = context.strip()
+
+    cache_key = None
+    if not os.getenv("NEXUS_NO_CACHE"):
+        cache_key = (user_text.strip().lower(), history, context, LLM_PROVIDER)
+        cached = _plan_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+    # Deterministic fast path: trivial single-app commands skip the LLM.
+    # Only when there's no history - referential turns need the model.
+    if not history and not os.getenv("NEXUS_NO_FASTPATH"):
+        fast = _fast_path_plan(user_text)
+        if fast is not None:
+            if on_speak and fast.response_text:
+                on_speak(fast.response_text)
+            return fast
+
+    sem_vec = None
+    if _sem_enabled() and _sem_cache_applicable(history, context):
+        sem_vec, sem_plan = _semantic_cache_get(user_text)
+        if sem_plan is not None:
+            if on_speak and sem_plan.response_text:
+                on_speak(sem_plan.response_text)
+            return sem_plan
+
+    plan, ok = _plan_turn_tiered(user_text, history, context, on_speak)
+    if ok and _cacheable(plan):
+        if cache_key is not None:
+            _plan_cache_put(cache_key, plan)
+        if sem_vec is not None:
+            _semantic_cache_put(sem_vec, plan)
+    return plan
+
+
+def plan_turns_batch(turns: List[tuple[str, str, str]]) -> List[TurnPlan]:
     """
+    Plan several turns with a single request. Each element of `turns` is
+    (user_text, history, context); the result list lines up by index.
+
+    Meant for replay/eval workloads or bursts where turns queue up faster
+    than one round-trip: the ~5KB system prompt is paid once for the whole
+    batch instead of once per turn.
+    """
+    if not turns:
+        return []
+
     client = _get_client()
-    
-    # Select model based on provider
     if LLM_PROVIDER == "local":
         model = LLM_LOCAL_MODEL
     else:
-        model = os.getenv("NEXUS_PLAN_MODEL", "gpt-4o-mini")
-        
-    from pathlib import Path
-    prompt_file = Path(__file__).parent.parent / "prompts" / "planner_prompt.txt"
-    system_prompt = prompt_file.read_text(encoding="utf-8")
-
-    # Combine History + Context + User Input matches prompt expectations
-    messages = [
-        {"role": "system", "content": system_prompt},
+        model = os.getenv("NEXUS_PLAN_FAST_MODEL", os.getenv("NEXUS_PLAN_MODEL", "gpt-4o-mini"))
+
+    payload = [
+        {"i": i, "text": normalize_aliases(text), "history": history, "context": context}
+        for i, (text, history, context) in enumerate(turns)
     ]
-    
-    # Add chat history (naive parsing, ensuring correct role)
-    # The history string passed in is usually just raw text blocks.
-    # We'll just append it as context if simple, or try to be smarter.
-    # For now, let's stick to the prompt structure expected:
-    
-    # Context Builder
+    user_content = (
+        "Plan each transcript below independently, following the normal rules.\n"
+        'Return ONLY JSON of the form {"results": [<one output object per transcript, same order>]}.\n\n'
+        + orjson.dumps(payload).decode()
+    )
+
+    try:
+        resp = client.chat.completions.create(
+            model=model,
+            temperature=0,
+            max_tokens=LLM_MAX_TOKENS * len(turns),
+            messages=[_SYSTEM_MESSAGE, {"role": "user", "content": user_content}],
+            **_create_kwargs()
+        )
+        content = resp.choices[0].message.content or ""
+        brace_start = content.find('{')
+        data = orjson.loads(content[brace_start:content.rfind('}') + 1]) if brace_start != -1 else {}
+        results = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(results, list):
+            results = []
+    except Exception as e:
+        print(f"[Planner] Batch error: {e}")
+        results = []
+
+    plans: List[TurnPlan] = []
+    for i in range(len(turns)):
+        item = results[i] if i < len(results) else None
+        plan = _parse_turn_plan(item) if isinstance(item, dict) else None
+        plans.append(plan if plan is not None else TurnPlan(actions=[]))
+    return plans
+
+
+def plan_turns_offline(jsonl_path: str, poll_interval: float = 30.0) -> Dict[str, TurnPlan]:
+    """
+    Run a transcript corpus through OpenAI's Batch API (half the price of
+    live requests, 24h completion window). For regression evals and memory
+    backfills there is no latency requirement, so paying interactive rates
+    per turn is wasted money.
+
+    Input file: one JSON object per line with "custom_id", "text" and
+    optional "history"/"context". Blocks until the batch finishes and
+    returns {custom_id: TurnPlan}, each result parsed through the same
+    schema path as live turns. Requires the "openai" provider.
+    """
+    if LLM_PROVIDER == "local":
+        raise RuntimeError("plan_turns_offline requires the openai provider")
+
+    client = _get_client()
+    model = os.getenv("NEXUS_PLAN_FAST_MODEL", os.getenv("NEXUS_PLAN_MODEL", "gpt-4o-mini"))
+
+    requests_path = Path(jsonl_path).with_suffix(".batch.jsonl")
+    with open(jsonl_path, encoding="utf-8") as src, open(requests_path, "w", encoding="utf-8") as dst:
+        for line in src:
+            line = line.strip()
+            if not line:
+                continue
+            row = orjson.loads(line)
+            entry = {
+                "custom_id": str(row["custom_id"]),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "temperature": 0,
+                    "max_tokens": LLM_MAX_TOKENS,
+                    "messages": _build_messages(
+                        row["text"], row.get("history", ""), row.get("context", "")
+                    ),
+                    **_create_kwargs(),
+                },
+            }
+            dst.write(orjson.dumps(entry).decode() + "\n")
+
+    with open(requests_path, "rb") as f:
+        batch_file = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+    plans: Dict[str, TurnPlan] = {}
+    output = client.files.content(batch.output_file_id).text
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        row = orjson.loads(line)
+        custom_id = row.get("custom_id", "")
+        try:
+            content = row["response"]["body"]["choices"][0]["message"]["content"] or ""
+            brace_start = content.find('{')
+            data = orjson.loads(content[brace_start:content.rfind('}') + 1])
+            plan = _parse_turn_plan(data)
+        except (KeyError, IndexError, TypeError, ValueError):
+            plan = None
+        plans[custom_id] = plan if plan is not None else TurnPlan(actions=[])
+    return plans
+
+
+def _pick_model(user_text: str, history: str, context: str) -> str:
+    """
+    Choose the cheapest tier a turn can get away with. Short utterances
+    with no history or running-apps context don't need gpt-4o-mini's
+    reasoning; the nano tier classifies them faster and cheaper. Invalid
+    or UNKNOWN plans still escalate to the strong model regardless.
+    The empty-app-list canonical_context form counts as no context, same
+    as the semantic-cache gate - otherwise live turns could never reach
+    the nano tier.
+    """
+    if len(user_text.strip()) < 40 and not history and context in ("", _EMPTY_CONTEXT):
+        return os.getenv("NEXUS_PLAN_NANO_MODEL", "gpt-4.1-nano")
+    return os.getenv("NEXUS_PLAN_FAST_MODEL", os.getenv("NEXUS_PLAN_MODEL", "gpt-4o-mini"))
+
+
+def _plan_turn_tiered(
+    user_text: str,
+    history: str = "",
+    context: str = "",
+    on_speak: Optional[Callable[[str], None]] = None,
+) -> tuple[TurnPlan, bool]:
+    """Model selection + fallback escalation around _plan_turn_once."""
+    if LLM_PROVIDER == "local":
+        return _plan_turn_once(LLM_LOCAL_MODEL, user_text, history, context, on_speak)
+
+    fast_model = _pick_model(user_text, history, context)
+    strong_model = os.getenv("NEXUS_PLAN_STRONG_MODEL", "gpt-4o")
+
+    # Track whether the fast attempt already spoke so an escalated retry
+    # doesn't trigger TTS twice.
+    spoke = [False]
+    def on_speak_once(text: str) -> None:
+        spoke[0] = True
+        if on_speak:
+            on_speak(text)
+
+    plan, ok = _plan_turn_once(fast_model, user_text, history, context, on_speak_once)
+
+    needs_escalation = (not ok) or any(st.intent == Intent.UNKNOWN for st in plan.actions)
+    if needs_escalation and strong_model != fast_model:
+        print(f"[Planner] Escalating to {strong_model}")
+        plan, ok = _plan_turn_once(
+            strong_model, user_text, history, context,
+            None if spoke[0] else on_speak,
+        )
+    return plan, ok
+
+
+def _build_messages(user_text: str, history: str = "", context: str = "") -> list[dict]:
+    """Build the [system, user] message pair for one planner request."""
+    # Fix obvious phonetic mishearings locally so the LLM doesn't have to
+    user_text = normalize_aliases(user_text)
+
+    # Context Builder. Order matters for prompt caching: the stable parts
+    # (history, then running-apps context) come first so they extend the
+    # cached prefix; the per-turn date and transcript go last.
     from datetime import datetime
     now = datetime.now()
-    user_content = f"CURRENT DATE: {now.strftime('%Y-%m-%d (%A) %H:%M')}\n"
-    user_content += f"USER AUDIO TRANSCRIPT: {user_text}\n"
-    
+    parts: list[str] = []
     if history:
-         user_content += f"\n[Chat History]\n{history}\n"
+        parts.append(f"[Chat History]\n{history}")
     if context:
-         user_content += f"\n[System Context]\n{context}\n"
+        parts.append(f"[System Context]\n{context}")
+    parts.append(f"CURRENT DATE: {now.strftime('%Y-%m-%d (%A) %H:%M')}")
+    parts.append(f"USER AUDIO TRANSCRIPT: {user_text}")
+    user_content = "\n\n".join(parts) + "\n"
+
+    return [_SYSTEM_MESSAGE, {"role": "user", "content": user_content}]
+
+
+def _create_kwargs() -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {}
+    if LLM_PROVIDER != "local":
+        # Route every planner request with the same cache key so OpenAI's
+        # automatic prompt caching keeps the static system prefix warm on
+        # the same backend (the system message is a frozen module constant,
+        # so its bytes are identical across turns).
+        kwargs["prompt_cache_key"] = os.getenv("NEXUS_CACHE_KEY", "nexus-planner-v1")
+        # JSON mode guarantees a parseable body, so the json.loads failure
+        # path never fires on the API provider. The model then carries the
+        # spoken reply in response_text instead of a SPEAK line; the stream
+        # accumulator picks it up early either way.
+        kwargs["response_format"] = {"type": "json_object"}
+    return kwargs
+
+
+# Matches a complete "response_text" string value inside streamed JSON
+_RESPONSE_TEXT_RE = re.compile(r'"response_text"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Matches CLOSE_ALL_APPS only as an intent value (both the JSON-mode and
+# the plain-text protocol emit actions as {"intent": "..."}), never the
+# bare token inside response_text prose.
+_CLOSE_ALL_INTENT_RE = re.compile(r'"intent"\s*:\s*"CLOSE_ALL_APPS"')
+
 
-    messages.append({"role": "user", "content": user_content})
+class _StreamAccumulator:
+    """
+    Accumulates streamed deltas and fires on_speak as soon as the spoken
+    reply is complete - either a 'SPEAK: "..."' line (plain-text protocol)
+    or the response_text field of a JSON-mode response - without waiting
+    for the rest of the stream.
+    """
+
+    def __init__(self, on_speak: Optional[Callable[[str], None]] = None):
+        self.on_speak = on_speak
+        self.full_content = ""
+        self.line_buffer = ""
+        self.speak_text_found = False
+        self.captured_response_text = ""
+        self.abort_close_all = False
+
+    def feed(self, delta: str) -> None:
+        self.full_content += delta
+        self.line_buffer += delta
+
+        # CLOSE_ALL_APPS makes every other step moot (_coerce_action_steps
+        # discards them), so the rest of the stream is wasted tokens - the
+        # caller can cancel as soon as the intent shows up.
+        if not self.abort_close_all and _CLOSE_ALL_INTENT_RE.search(self.full_content):
+            self.abort_close_all = True
+
+        if not self.speak_text_found and '"response_text"' in self.full_content:
+            m = _RESPONSE_TEXT_RE.search(self.full_content)
+            if m:
+                try:
+                    raw_text = orjson.loads(f'"{m.group(1)}"')
+                except ValueError:
+                    raw_text = m.group(1)
+                if raw_text:
+                    self.captured_response_text = raw_text
+                    self.speak_text_found = True
+                    if self.on_speak:
+                        self.on_speak(raw_text)
+
+        if "\n" in self.line_buffer and not self.speak_text_found:
+            lines = self.line_buffer.split("\n")
+            # Process all complete lines
+            for line in lines[:-1]:
+                clean_line = line.strip()
+                if clean_line.startswith("SPEAK:"):
+                    raw_text = clean_line[6:].strip()
+                    # Remove quotes if present
+                    if raw_text.startswith('"') and raw_text.endswith('"'):
+                        raw_text = raw_text[1:-1]
+
+                    self.captured_response_text = raw_text
+                    self.speak_text_found = True
+
+                    if self.on_speak:
+                        self.on_speak(self.captured_response_text)
+
+            # Keep the last incomplete line
+            self.line_buffer = lines[-1]
+
+
+def _finish_stream(acc: _StreamAccumulator) -> tuple[TurnPlan, bool]:
+    """Extract and parse the JSON block from a fully accumulated stream."""
+    full_content = acc.full_content
+    captured_response_text = acc.captured_response_text
+
+    # Heuristic: find start of JSON object
+    brace_start = full_content.find('{')
+    if brace_start == -1:
+        # Maybe no JSON? Just response?
+        return TurnPlan(
+            response_text=captured_response_text or full_content,
+            actions=[]
+        ), False
+
+    valid_json_str = full_content[brace_start:]
+    brace_end = valid_json_str.rfind('}')
+    if brace_end != -1:
+        valid_json_str = valid_json_str[:brace_end+1]
+
+    # orjson decodes the (up to several KB) plan body 2-5x faster than
+    # stdlib json; this runs on every non-fast-path turn.
+    data = orjson.loads(valid_json_str)
+
+    # Validation + TurnPlan construction in a single pass
+    plan = _parse_turn_plan(data, captured_response_text)
+    if plan is None:
+        fallback_text = captured_response_text
+        if not fallback_text and isinstance(data, dict):
+            fallback_text = str(data.get("response_text", ""))
+        return TurnPlan(response_text=fallback_text, actions=[]), False
+
+    return plan, True
+
+
+def _plan_turn_once(
+    model: str,
+    user_text: str,
+    history: str = "",
+    context: str = "",
+    on_speak: Optional[Callable[[str], None]] = None,
+) -> tuple[TurnPlan, bool]:
+    """
+    Single planner attempt against one model.
+    Returns (plan, ok) where ok is False when the model output failed to
+    parse or validate, so the caller can escalate to a stronger model.
+    """
+    client = _get_client()
+    messages = _build_messages(user_text, history, context)
 
     try:
         stream = client.chat.completions.create(
@@ -183,92 +869,133 @@ def plan_turn(user_text: str, history: str = "", context: str = "", on_speak: Op
             temperature=0,
             max_tokens=LLM_MAX_TOKENS,
             messages=messages,
-            stream=True
+            stream=True,
+            **_create_kwargs()
         )
-        
-        full_content = ""
-        line_buffer = ""
-        speak_text_found = False
-        captured_response_text = ""
-        
+
+        acc = _StreamAccumulator(on_speak)
         for chunk in stream:
-            delta = chunk.choices[0].delta.content or ""
-            full_content += delta
-            line_buffer += delta
-            
-            if "\n" in line_buffer and not speak_text_found:
-                lines = line_buffer.split("\n")
-                # Process all complete lines
-                for line in lines[:-1]:
-                    clean_line = line.strip()
-                    if clean_line.startswith("SPEAK:"):
-                        # Found extracting speak text
-                        raw_text = clean_line[6:].strip()
-                        # Remove quotes if present
-                        if raw_text.startswith('"') and raw_text.endswith('"'):
-                            raw_text = raw_text[1:-1]
-                        
-                        captured_response_text = raw_text
-                        speak_text_found = True
-                        
-                        if on_speak:
-                            on_speak(captured_response_text)
-                
-                # Keep the last incomplete line
-                line_buffer = lines[-1]
-
-        # Post-processing: Extract JSON
-        # If we found SPEAK line, the JSON should be after it.
-        # But full_content has everything.
-        
-        valid_json_str = full_content
-        
-        # Heuristic: find start of JSON object
-        brace_start = full_content.find('{')
-        if brace_start != -1:
-            valid_json_str = full_content[brace_start:]
-            # And end
-            brace_end = valid_json_str.rfind('}')
-            if brace_end != -1:
-                valid_json_str = valid_json_str[:brace_end+1]
-        else:
-            # Maybe no JSON? Just response?
-            return TurnPlan(
-                response_text=captured_response_text or full_content,
-                actions=[]
-            )
+            acc.feed(chunk.choices[0].delta.content or "")
+            if acc.abort_close_all:
+                stream.close()
+                return _close_all_plan(acc)
 
-        data = json.loads(valid_json_str) 
-        
-        # If we didn't capture SPEAK from stream, maybe it's in JSON?
-        if not captured_response_text:
-             captured_response_text = str(data.get("response_text", "")).strip()
+        return _finish_stream(acc)
 
-        # Parse memory/actions standard way
-        mr = data.get("memory_read")
-        memory_read: Optional[MemoryRead] = None
-        if isinstance(mr, dict):
-            memory_read = MemoryRead(query=str(mr.get("query", "")), limit=int(mr.get("limit") or 5))
+    except Exception as e:
+        print(f"[Planner] Error: {e}")
+        return TurnPlan(
+            response_text=f"I encountered an error: {e}",
+            actions=[]
+        ), False
 
-        mw = data.get("memory_write")
-        memory_write: Optional[MemoryWrite] = None
-        if isinstance(mw, dict):
-            should_store = bool(mw.get("should_store"))
-            memory_write = MemoryWrite(should_store=should_store, confidence=float(mw.get("confidence") or 0.0), note=mw.get("note") if should_store else None)
 
-        actions_raw = data.get("actions") or []
-        actions = _coerce_action_steps(actions_raw if isinstance(actions_raw, list) else [])
+def _close_all_plan(acc: _StreamAccumulator) -> tuple[TurnPlan, bool]:
+    """Plan synthesized after an early CLOSE_ALL_APPS stream cancel."""
+    return TurnPlan(
+        actions=[ActionStep(intent=Intent.CLOSE_ALL_APPS, args={})],
+        response_text=acc.captured_response_text or "Closing all apps.",
+    ), True
 
-        return TurnPlan(
-            response_text=captured_response_text,
-            memory_read=memory_read, 
-            memory_write=memory_write, 
-            actions=actions
-        )
+
+async def _plan_turn_once_async(
+    model: str,
+    user_text: str,
+    history: str = "",
+    context: str = "",
+    on_speak: Optional[Callable[[str], None]] = None,
+) -> tuple[TurnPlan, bool]:
+    """Async twin of _plan_turn_once, driven by the AsyncOpenAI client."""
+    client = _get_aclient()
+    messages = _build_messages(user_text, history, context)
+
+    # Pace API requests below the account RPM so the SDK's 429 backoff
+    # never fires mid-turn; LM Studio has no rate limit to respect.
+    limiter = _RATE_LIMITER if LLM_PROVIDER != "local" else nullcontext()
+
+    try:
+        async with limiter:
+            stream = await client.chat.completions.create(
+                model=model,
+                temperature=0,
+                max_tokens=LLM_MAX_TOKENS,
+                messages=messages,
+                stream=True,
+                **_create_kwargs()
+            )
+
+            acc = _StreamAccumulator(on_speak)
+            async for chunk in stream:
+                acc.feed(chunk.choices[0].delta.content or "")
+                if acc.abort_close_all:
+                    await stream.close()
+                    return _close_all_plan(acc)
+
+        return _finish_stream(acc)
 
     except Exception as e:
         print(f"[Planner] Error: {e}")
         return TurnPlan(
             response_text=f"I encountered an error: {e}",
             actions=[]
-        )
\ No newline at end of file
+        ), False
+
+
+async def plan_turn_async(user_text: str, history: str = "", context: str = "", on_speak: Optional[Callable[[str], None]] = None) -> TurnPlan:
+    """
+    Async variant of plan_turn for callers already inside an event loop.
+    Awaiting this instead of calling plan_turn keeps the loop free to
+    overlap the network round-trip with other per-turn I/O (memory reads,
+    TTS). Shares the response cache and tiering logic with plan_turn.
+    """
+    history = history.strip()
+    context = context.strip()
+
+    cache_key = None
+    if not os.getenv("NEXUS_NO_CACHE"):
+        cache_key = (user_text.strip().lower(), history, context, LLM_PROVIDER)
+        cached = _plan_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+    if not history and not os.getenv("NEXUS_NO_FASTPATH"):
+        fast = _fast_path_plan(user_text)
+        if fast is not None:
+            if on_speak and fast.response_text:
+                on_speak(fast.response_text)
+            return fast
+
+    sem_vec = None
+    if _sem_enabled() and _sem_cache_applicable(history, context):
+        sem_vec, sem_plan = _semantic_cache_get(user_text)
+        if sem_plan is not None:
+            if on_speak and sem_plan.response_text:
+                on_speak(sem_plan.response_text)
+            return sem_plan
+
+    if LLM_PROVIDER == "local":
+        plan, ok = await _plan_turn_once_async(LLM_LOCAL_MODEL, user_text, history, context, on_speak)
+    else:
+        fast_model = _pick_model(user_text, history, context)
+        strong_model = os.getenv("NEXUS_PLAN_STRONG_MODEL", "gpt-4o")
+
+        spoke = [False]
+        def on_speak_once(text: str) -> None:
+            spoke[0] = True
+            if on_speak:
+                on_speak(text)
+
+        plan, ok = await _plan_turn_once_async(fast_model, user_text, history, context, on_speak_once)
+        if ((not ok) or any(st.intent == Intent.UNKNOWN for st in plan.actions)) and strong_model != fast_model:
+            print(f"[Planner] Escalating to {strong_model}")
+            plan, ok = await _plan_turn_once_async(
+                strong_model, user_text, history, context,
+                None if spoke[0] else on_speak,
+            )
+
+    if ok and _cacheable(plan):
+        if cache_key is not None:
+            _plan_cache_put(cache_key, plan)
+        if sem_vec is not None:
+            _semantic_cache_put(sem_vec, plan)
+    return plan
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Client-side rate limiting for outbound LLM requests.
+
+Bursts (several queued voice turns, batch helpers) can trip the account
+RPM limit, and the OpenAI SDK then eats a 429 with exponential backoff in
+the middle of a turn - a silent multi-second latency spike. Pacing
+requests below the limit on our side means the backoff path never fires.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Async context manager combining a concurrency cap with a
+    requests-per-minute token bucket. Entering waits until both a
+    concurrency slot and a request token are available.
+    """
+
+    def __init__(self, rpm: int = 300, max_concurrent: int = 8):
+        self._rpm = max(1, rpm)
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self._tokens = float(self._rpm)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self._sem.acquire()
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self._rpm),
+                self._tokens + (now - self._last_refill) * self._rpm / 60.0,
+            )
+            self._last_refill = now
+            if self._tokens < 1.0:
+                await asyncio.sleep((1.0 - self._tokens) * 60.0 / self._rpm)
+                self._tokens = 1.0
+            self._tokens -= 1.0
+        return self
+
+    async def __aexit__(self, *exc) -> bool:
+        self._sem.release()
+        return False
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict
 from core.models import ActionStep, Command, Result
 from core.intent import Intent
 
@@ -9,16 +9,33 @@ SkillHandler = Callable[[ActionStep], Result]
 ChatHandler = Callable[[Command], Result]
 
 
+# One failed Result per intent, materialized at import - Result is frozen,
+# so unknown-intent dispatches can share these instead of re-rendering the
+# f-string and allocating per call.
+_UNKNOWN_RESULTS: Dict[Intent, Result] = {
+    i: Result(ok=False, message=f"No skill registered for intent {i.value}.")
+    for i in Intent
+}
+
+
+def _unknown_handler(step: ActionStep) -> Result:
+    return _UNKNOWN_RESULTS[step.intent]
+
+
+class _RouteMap(Dict[Intent, SkillHandler]):
+    """Route table whose misses resolve to the unknown-intent handler, so
+    dispatch is a bare __getitem__ with no None check on the hot path."""
+
+    def __missing__(self, intent: Intent) -> SkillHandler:
+        return _unknown_handler
+
+
 class Router:
     def __init__(self) -> None:
-        self._action_routes: Dict[Intent, SkillHandler] = {}
-        
+        self._action_routes: _RouteMap = _RouteMap()
 
     def register_action(self, intent: Intent, handler: SkillHandler) -> None:
-        self._action_routes[intent] = handler       
+        self._action_routes[intent] = handler
 
     def dispatch_step(self, step: ActionStep) -> Result:
-        handler = self._action_routes.get(step.intent)
-        if handler is None:
-            return Result(ok=False, message=f"No skill registered for intent {step.intent.value}.")
-        return handler(step)
+        return self._action_routes[step.intent](step)
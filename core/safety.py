@@ -1,21 +1,28 @@
 from __future__ import annotations
 
+import functools
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, Callable
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Callable, Mapping
 
 from core.models import ActionStep, Command
 from core.intent import Intent
 
+__all__ = ["PROTECTED_APPS", "SafetyDecision", "check_step", "check_command"]
 
-# Apps/processes you should never try to quit
-PROTECTED_APPS = {
+
+# Apps/processes you should never try to quit. Stored casefolded in a
+# frozenset so membership checks are case-insensitive - macOS app names
+# arrive with inconsistent casing ("terminal" vs "Terminal").
+PROTECTED_APPS: frozenset[str] = frozenset(s.casefold() for s in {
     "System", "System Settings", "SystemUIServer", "WindowServer",
     "ControlCenter", "NotificationCenter", "Finder", "Dock",
     "loginwindow", "Terminal", "iTerm2", "Nexus",
-}
+})
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SafetyDecision:
     """Result of a safety check on an action."""
     allowed: bool
@@ -43,49 +50,80 @@ class SafetyDecision:
 # HANDLERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# SafetyDecision is frozen, so decisions whose content never varies can be
+# shared module-level singletons instead of being re-allocated on every
+# step - the plain-allow path is the hottest branch in the checker.
+_ALLOW = SafetyDecision.allow()
+_ALLOW_CHAT = SafetyDecision.allow("chat")
+_BLOCK_UNKNOWN = SafetyDecision.block("unknown intent", "I don't understand that command.")
+_CONFIRM_CLOSE_ALL = SafetyDecision.allow_with_confirmation(
+    "I'm about to close ALL running applications. Are you sure?")
+_CONFIRM_STOP = SafetyDecision.allow_with_confirmation(
+    "I'm about to shut down completely. Are you sure?")
+_CONFIRM_RESTART = SafetyDecision.allow_with_confirmation(
+    "I'm about to restart myself. Confirm?")
+_CONFIRM_NO_PROMPT = SafetyDecision(True, "ok", True)
+
+
 def _handle_unknown(args: Dict[str, Any]) -> SafetyDecision:
-    return SafetyDecision.block("unknown intent", "I don't understand that command.")
+    return _BLOCK_UNKNOWN
 
 def _handle_open_app(args: Dict[str, Any]) -> SafetyDecision:
-    app = args.get("app_name", "")
-    if not app or not app.strip():
+    app = str(args.get("app_name", "")).strip()
+    if not app:
         return SafetyDecision.block("missing app_name", "Which app should I open?")
-    if app.strip() == "System":
+    if app.casefold() == "system":
         return SafetyDecision.block("protected", "I can't open that system process.")
-    return SafetyDecision.allow()
+    return _ALLOW
 
 def _handle_close_app(args: Dict[str, Any]) -> SafetyDecision:
-    app = args.get("app_name", "")
-    if not app or not app.strip():
+    app = str(args.get("app_name", "")).strip()
+    if not app:
         return SafetyDecision.block("missing app_name", "Which app should I close?")
-    if app.strip() in PROTECTED_APPS:
+    if app.casefold() in PROTECTED_APPS:
         return SafetyDecision.block("protected", f"I can't close {app} - it's a protected system app.")
     return SafetyDecision.allow_with_confirmation(f"I'll close {app}. Confirm?")
 
 def _handle_close_all(args: Dict[str, Any]) -> SafetyDecision:
-    return SafetyDecision.allow_with_confirmation("I'm about to close ALL running applications. Are you sure?")
+    return _CONFIRM_CLOSE_ALL
 
 def _handle_search_web(args: Dict[str, Any]) -> SafetyDecision:
     if not args.get("query"):
         return SafetyDecision.block("missing query", "What should I search for?")
-    return SafetyDecision.allow()
+    return _ALLOW
 
 def _handle_open_url(args: Dict[str, Any]) -> SafetyDecision:
     if not args.get("url"):
         return SafetyDecision.block("missing url", "Which URL should I open?")
-    return SafetyDecision.allow()
+    return _ALLOW
 
 def _handle_create_note(args: Dict[str, Any]) -> SafetyDecision:
     if not args.get("content"):
         return SafetyDecision.block("missing content", "What should the note say?")
-    return SafetyDecision.allow()
+    return _ALLOW
+
+def _op(args: Dict[str, Any]) -> str:
+    """Normalized operation name: one .lower(), no str() wrapper."""
+    v = args.get("operation")
+    return v.lower() if isinstance(v, str) else ""
+
+
+def _arg_str(args: Dict[str, Any], *keys: str) -> str:
+    """First non-empty string arg among keys, stripped once."""
+    for k in keys:
+        v = args.get(k)
+        if isinstance(v, str):
+            v = v.strip()
+            if v:
+                return v
+    return ""
+
 
 def _handle_calendar(args: Dict[str, Any]) -> SafetyDecision:
-    op = str(args.get("operation") or "").lower()
-    if op == "create":
-        title = str(args.get("title") or "").strip()
-        date = str(args.get("date") or args.get("startDate") or "").strip()
-        time = str(args.get("time") or args.get("startTime") or "").strip()
+    if _op(args) == "create":
+        title = _arg_str(args, "title")
+        date = _arg_str(args, "date", "startDate")
+        time = _arg_str(args, "time", "startTime")
         
         desc_parts = []
         if title: desc_parts.append(f'"{title}"')
@@ -94,22 +132,20 @@ def _handle_calendar(args: Dict[str, Any]) -> SafetyDecision:
         
         desc = " ".join(desc_parts) if desc_parts else "a new event"
         return SafetyDecision.allow_with_confirmation(f"I'll create {desc}. Confirm?")
-    return SafetyDecision.allow()
+    return _ALLOW
 
 def _handle_reminders(args: Dict[str, Any]) -> SafetyDecision:
-    op = str(args.get("operation") or "").lower()
-    if op == "create":
-        name = str(args.get("name") or "").strip() or "a reminder"
+    if _op(args) == "create":
+        name = _arg_str(args, "name") or "a reminder"
         return SafetyDecision.allow_with_confirmation(f"I'll create a reminder ({name}). Confirm?")
-    return SafetyDecision.allow()
+    return _ALLOW
 
 def _handle_mail(args: Dict[str, Any]) -> SafetyDecision:
-    op = str(args.get("operation") or "").lower()
-    if op == "send":
-        to = str(args.get("to") or "").strip()
-        subject = str(args.get("subject") or "").strip()
+    if _op(args) == "send":
+        to = _arg_str(args, "to")
+        subject = _arg_str(args, "subject")
         return SafetyDecision.allow_with_confirmation(f"I'll send an email to {to} ({subject}). Confirm?")
-    return SafetyDecision.allow()
+    return _ALLOW
 
 def _handle_send_message(args: Dict[str, Any]) -> SafetyDecision:
     recipient = args.get("recipient", "")
@@ -126,26 +162,30 @@ def _handle_type_text(args: Dict[str, Any]) -> SafetyDecision:
     if not message:
         return SafetyDecision.block("missing message", "What should I type?")
     target = person if person else "the active window"
-    preview = message[:40] + "..." if len(message) > 40 else message
+    preview = f"{message[:40]}..." if len(message) > 40 else message
     return SafetyDecision.allow_with_confirmation(f"I'll type '{preview}' in {target}. Confirm?")
 
 def _handle_read_messages(args: Dict[str, Any]) -> SafetyDecision:
-    contact = args.get("contact") or args.get("recipient") or ""
-    if not str(contact).strip():
+    if not _arg_str(args, "contact", "recipient"):
         return SafetyDecision.block("missing contact", "Which contact should I read messages for?")
-    return SafetyDecision.allow()
+    return _ALLOW
 
 def _handle_safe_pass(args: Dict[str, Any]) -> SafetyDecision:
-    return SafetyDecision.allow()
+    return _ALLOW
 
 def _handle_stop_nexus(args: Dict[str, Any]) -> SafetyDecision:
-    return SafetyDecision.allow_with_confirmation("I'm about to shut down completely. Are you sure?")
+    return _CONFIRM_STOP
 
 def _handle_restart_nexus(args: Dict[str, Any]) -> SafetyDecision:
-    return SafetyDecision.allow_with_confirmation("I'm about to restart myself. Confirm?")
+    return _CONFIRM_RESTART
+
+# Shared read-only stand-in for absent step args, so checking an argless
+# step doesn't allocate a throwaway dict (handlers only ever .get from it).
+_EMPTY_ARGS: Dict[str, Any] = {}
 
-# Dispatch Table
-_HANDLERS: Dict[Intent, Callable[[Dict[str, Any]], SafetyDecision]] = {
+# Dispatch Table - read-only after import; the proxy makes any attempted
+# mutation a TypeError instead of a silent policy change.
+_HANDLERS: Mapping[Intent, Callable[[Dict[str, Any]], SafetyDecision]] = MappingProxyType({
     Intent.UNKNOWN: _handle_unknown,
     Intent.OPEN_APP: _handle_open_app,
     Intent.CLOSE_APP: _handle_close_app,
@@ -170,60 +210,143 @@ _HANDLERS: Dict[Intent, Callable[[Dict[str, Any]], SafetyDecision]] = {
     Intent.EXIT: _handle_safe_pass,
     Intent.STOP_NEXUS: _handle_stop_nexus,
     Intent.RESTART_NEXUS: _handle_restart_nexus,
-}
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _check_step_cached(intent: Intent, items: tuple) -> SafetyDecision:
+    # _HANDLERS covers every Intent member, so the miss branch never runs
+    # in practice - try/except makes the hit a bare __getitem__ while
+    # keeping the fail-closed block for any future unmapped intent.
+    try:
+        handler = _HANDLERS[intent]
+    except KeyError:
+        return SafetyDecision.block("no policy", f"I don't have a safety policy for {intent.value}. Blocked for safety.")
+    return handler(dict(items) if items else _EMPTY_ARGS)
 
 
 def check_step(step: ActionStep) -> SafetyDecision:
     """
     Safety gate for all actions. Returns whether an action is allowed,
     and whether it requires user confirmation.
-    """
-    handler = _HANDLERS.get(step.intent)
-    if not handler:
-        return SafetyDecision.block("no policy", f"I don't have a safety policy for {step.intent.value}. Blocked for safety.")
-    
-    return handler(step.args or {})
 
-
-def check_command(cmd: Command) -> SafetyDecision:  
+    Decisions are pure functions of (intent, args), so recurring steps
+    ("OPEN_APP Safari" every morning) are served from an LRU of frozen
+    decisions; steps with unhashable arg values take the direct path.
+    """
+    try:
+        return _check_step_cached(
+            step.intent,
+            tuple(sorted(step.args.items())) if step.args else (),
+        )
+    except TypeError:
+        try:
+            handler = _HANDLERS[step.intent]
+        except KeyError:
+            return SafetyDecision.block("no policy", f"I don't have a safety policy for {step.intent.value}. Blocked for safety.")
+        return handler(step.args)
+
+
+# Repeat plans (planner cache hits, retried confirmations) re-run the full
+# per-step walk and prompt assembly; fingerprinting the steps lets those
+# return the previous frozen decision in one dict lookup. Commands whose
+# args aren't hashable (nested structures) simply skip the cache.
+_CMD_CACHE: "OrderedDict[tuple, SafetyDecision]" = OrderedDict()
+_CMD_CACHE_MAX = 256
+
+
+def _freeze_value(v: Any) -> Any:
+    if isinstance(v, list):
+        return tuple(_freeze_value(x) for x in v)
+    if isinstance(v, dict):
+        return tuple(sorted((k, _freeze_value(x)) for k, x in v.items()))
+    return v
+
+
+def _command_fingerprint(cmd: Command) -> Optional[tuple]:
+    try:
+        key = tuple(
+            (s.intent, tuple(sorted((k, _freeze_value(v)) for k, v in (s.args or {}).items())))
+            for s in cmd.steps
+        )
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
+
+def check_command(cmd: Command, build_prompt: bool = True) -> SafetyDecision:
+    """
+    Safety-check a whole command. With build_prompt=False only the
+    allowed/requires_confirmation verdict is computed - callers that never
+    show the confirmation text (tool loops, pre-checks) skip all the
+    prompt f-string assembly. Prompt-less results are not cached so a
+    later build_prompt=True call still gets the full prompt.
+    """
     if not cmd.steps:
-        return SafetyDecision.allow("chat")
-
-    requires_confirmation = False
-    custom_prompt = None
-    close_targets: list[str] = []
-    other_confirmations: list[str] = []
-
+        return _ALLOW_CHAT
+
+    key = _command_fingerprint(cmd) if build_prompt else None
+    if key is not None:
+        cached = _CMD_CACHE.get(key)
+        if cached is not None:
+            _CMD_CACHE.move_to_end(key)
+            return cached
+
+    decision = _check_command_uncached(cmd, build_prompt)
+    if key is not None:
+        _CMD_CACHE[key] = decision
+        while len(_CMD_CACHE) > _CMD_CACHE_MAX:
+            _CMD_CACHE.popitem(last=False)
+    return decision
+
+
+def _english_list(items: list[str]) -> str:
+    """Join names the way they'd be spoken: 'a', 'a and b', 'a, b, and c'."""
+    if len(items) == 1:
+        return items[0]
+    if len(items) == 2:
+        return f"{items[0]} and {items[1]}"
+    return ", ".join(items[:-1]) + f", and {items[-1]}"
+
+
+def _check_command_uncached(cmd: Command, build_prompt: bool = True) -> SafetyDecision:
+    # Validate first, build prompts second: most plans need no
+    # confirmation, and those return the shared singleton without ever
+    # touching the prompt-assembly lists.
+    confirmations: list[tuple[ActionStep, SafetyDecision]] = []
     for step in cmd.steps:
         d = check_step(step)
         if not d.allowed:
             return d
-        
         if d.requires_confirmation:
-            requires_confirmation = True
-            if step.intent == Intent.CLOSE_APP:
-                app = (step.args or {}).get("app_name", "")
-                if app:
-                    close_targets.append(app)
-            elif d.prompt:
-                other_confirmations.append(d.prompt)
+            confirmations.append((step, d))
+
+    if not confirmations:
+        return _ALLOW
+    if not build_prompt:
+        return _CONFIRM_NO_PROMPT
+
+    custom_prompt = None
+    close_targets: list[str] = []
+    other_confirmations: list[str] = []
+    for step, d in confirmations:
+        if step.intent == Intent.CLOSE_APP:
+            app = (step.args or {}).get("app_name", "")
+            if app:
+                close_targets.append(app)
+        elif d.prompt:
+            other_confirmations.append(d.prompt)
 
     if close_targets:
-        if len(close_targets) == 1:
-            close_msg = f"I'll close {close_targets[0]}. Confirm?"
-        elif len(close_targets) == 2:
-            close_msg = f"I'll close {close_targets[0]} and {close_targets[1]}. Confirm?"
-        else:
-            all_but_last = ", ".join(close_targets[:-1])
-            close_msg = f"I'll close {all_but_last}, and {close_targets[-1]}. Confirm?"
-        
+        close_msg = f"I'll close {_english_list(close_targets)}. Confirm?"
         if other_confirmations:
-            custom_prompt = close_msg + " Also: " + " ".join(other_confirmations)
+            custom_prompt = " ".join([close_msg, "Also:", *other_confirmations])
         else:
             custom_prompt = close_msg
     elif other_confirmations:
         custom_prompt = other_confirmations[0]
 
-    return SafetyDecision(True, "ok", requires_confirmation, custom_prompt)
+    return SafetyDecision(True, "ok", True, custom_prompt)
 
 
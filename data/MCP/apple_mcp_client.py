@@ -1,3 +1,4 @@
+import functools
 import os
 from typing import Any, Optional
 
@@ -5,6 +6,12 @@ from mcp import ClientSession
 from mcp.client.stdio import stdio_client, StdioServerParameters
 
 
+@functools.lru_cache(maxsize=1)
+def _env_snapshot() -> dict[str, str]:
+    """One copy of os.environ shared across subprocess (re)starts."""
+    return dict(os.environ)
+
+
 class AppleMCPClient:
     """
     MCP client for the Node/Bun-based apple-mcp server in `apple_mcp/apple-mcp/`.
@@ -22,7 +29,7 @@ class AppleMCPClient:
         params = StdioServerParameters(
             command=self.server_cmd[0],
             args=self.server_cmd[1:],
-            env=os.environ.copy(),
+            env=_env_snapshot(),
             cwd=self.cwd,
         )
         self._ctx = stdio_client(params)
@@ -43,32 +50,40 @@ class AppleMCPClient:
         if not self._session:
             raise RuntimeError("AppleMCPClient not started")
         res = await self._session.call_tool(tool_name, args)
-        out: dict[str, Any] = dict(res.structuredContent or {})
-
-        # apple-mcp typically returns `content: [{type:"text", text:"..."}]` (not structuredContent)
-        try:
-            content = getattr(res, "content", None)
-            if content and isinstance(content, list) and "text" not in out:
-                texts: list[str] = []
-                for item in content:
-                    try:
-                        t = getattr(item, "text", None) if not isinstance(item, dict) else item.get("text")
-                        if t:
-                            texts.append(str(t))
-                    except Exception:
-                        continue
-                if texts:
-                    out["text"] = "\n".join(texts).strip()
-        except Exception:
-            pass
+
+        # Borrow structuredContent instead of copying it - callers only
+        # read from the result, and large payloads (memory recall, message
+        # history) would otherwise be duplicated on every call. The dict
+        # is copied only if we need to graft in supplemental keys.
+        sc = res.structuredContent
+        out: dict[str, Any] = sc if isinstance(sc, dict) else {}
+        borrowed = out is sc
+
+        def _own() -> dict[str, Any]:
+            nonlocal out, borrowed
+            if borrowed:
+                out = dict(out)
+                borrowed = False
+            return out
+
+        # apple-mcp typically returns `content: [{type:"text", text:"..."}]`
+        # (not structuredContent). Neither dict.get nor a defaulted getattr
+        # can raise here, so no per-item exception frames are needed.
+        content = getattr(res, "content", None)
+        if content and isinstance(content, list) and "text" not in out:
+            texts = [
+                str(t) for t in (
+                    item.get("text") if isinstance(item, dict) else getattr(item, "text", None)
+                    for item in content
+                ) if t
+            ]
+            if texts:
+                _own()["text"] = "\n".join(texts).strip()
 
         # best-effort isError passthrough
-        try:
-            is_error = getattr(res, "isError", None)
-            if is_error is not None and "isError" not in out:
-                out["isError"] = bool(is_error)
-        except Exception:
-            pass
+        is_error = getattr(res, "isError", None)
+        if is_error is not None and "isError" not in out:
+            _own()["isError"] = bool(is_error)
 
         return out
 
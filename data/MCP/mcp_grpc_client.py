@@ -6,15 +6,40 @@ Usage:
     client = MCPGrpcClient()
     result = await client.call("ch_insert_note", {"content": "Test"})
 """
-import json
+import asyncio
+import logging
 import os
 from typing import Any, Dict
 
 import grpc
+import orjson
 
 # Import generated protobuf code
 from data.MCP import mcp_pb2, mcp_pb2_grpc
 
+logger = logging.getLogger("nexus")
+
+# Opt-in wire compression: text-heavy responses (notes, history) gzip
+# well, but tiny acks don't benefit, so it's off unless requested.
+_COMPRESSION = grpc.Compression.Gzip if os.getenv("NEXUS_GRPC_COMPRESS") == "1" else None
+
+# Channel tuning for long text responses (full-content ListNotes,
+# history) and an always-on local link: large message ceilings, 1 MB
+# HTTP/2 frames so big responses need fewer frames, and keepalives so
+# idle channels aren't torn down and re-handshaken between turns.
+# Distinct subchannels per pooled channel, or gRPC silently collapses
+# the pool back onto one shared TCP connection.
+_CHAN_OPTS = [
+    ("grpc.use_local_subchannel_pool", 1),
+    ("grpc.max_send_message_length", 32 * 1024 * 1024),
+    ("grpc.max_receive_message_length", 32 * 1024 * 1024),
+    ("grpc.http2.max_frame_size", 1024 * 1024),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+]
+
 
 class MCPGrpcClient:
     """High-performance gRPC client for MCP calls."""
@@ -22,15 +47,28 @@ class MCPGrpcClient:
     def __init__(self, host: str = None, port: str = None):
         self.host = host or os.getenv("NEXUS_GRPC_HOST", "localhost")
         self.port = port or os.getenv("NEXUS_GRPC_PORT", "50051")
-        self._channel = None
-        self._stub = None
+        self.pool_size = max(1, int(os.getenv("NEXUS_GRPC_POOL", "4")))
+        self._channels: list = []
+        self._stubs: list = []
+        self._rr = 0
     
-    def _get_stub(self):
-        """Lazy connection - connect on first use."""
-        if self._stub is None:
-            self._channel = grpc.insecure_channel(f"{self.host}:{self.port}")
-            self._stub = mcp_pb2_grpc.NexusMCPStub(self._channel)
-        return self._stub
+    def _pick_stub(self):
+        """Lazy connection - connect on first use.
+
+        Opens a small pool of channels instead of one: concurrent calls
+        on a single channel multiplex over one TCP connection and queue
+        behind HTTP/2 flow control, so round-robining across independent
+        connections lets them proceed in parallel.
+        """
+        if not self._stubs:
+            target = f"{self.host}:{self.port}"
+            for _ in range(self.pool_size):
+                channel = grpc.insecure_channel(
+                    target, options=_CHAN_OPTS, compression=_COMPRESSION)
+                self._channels.append(channel)
+                self._stubs.append(mcp_pb2_grpc.NexusMCPStub(channel))
+        self._rr = (self._rr + 1) % len(self._stubs)
+        return self._stubs[self._rr]
     
     async def call(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -43,14 +81,14 @@ class MCPGrpcClient:
         Returns:
             Tool result as dict
         """
-        stub = self._get_stub()
+        stub = self._pick_stub()
         
         # Use specific methods for common tools for better performance
         try:
             if tool_name == "pg_append_event":
                 response = stub.AppendEvent(mcp_pb2.AppendEventRequest(
                     kind=args.get("kind", ""),
-                    payload_json=json.dumps(args.get("payload", {})),
+                    payload_json=orjson.dumps(args.get("payload", {})),
                     session_id=args.get("session_id", "default"),
                     tags=args.get("tags", []),
                 ))
@@ -116,14 +154,75 @@ class MCPGrpcClient:
                 ))
                 return {"history": list(response.history)}
             
+            elif tool_name == "ch_update_note":
+                req = mcp_pb2.UpdateNoteRequest(note_id=args.get("note_id", ""))
+                if args.get("content") is not None:
+                    req.content = args["content"]
+                if args.get("title") is not None:
+                    req.title = args["title"]
+                if args.get("deadline") is not None:
+                    req.deadline = args["deadline"]
+                if args.get("status") is not None:
+                    req.status = args["status"]
+                if args.get("priority") is not None:
+                    req.priority = int(args["priority"])
+                if args.get("tags") is not None:
+                    req.update_tags = True
+                    req.tags.extend(args["tags"])
+                response = stub.UpdateNote(req)
+                return {"ok": response.ok, "note_id": response.note_id, "error": response.error}
+            
+            elif tool_name == "ch_get_note_by_id":
+                response = stub.GetNote(mcp_pb2.GetNoteRequest(
+                    note_id=args.get("note_id", ""),
+                ))
+                if not response.ok:
+                    return {"ok": False, "error": response.error}
+                n = response.note
+                return {"ok": True, "note": {
+                    "id": n.id,
+                    "created_at": n.created_at,
+                    "title": n.title,
+                    "content": n.content,
+                    "deadline": n.deadline,
+                    "status": n.status,
+                    "priority": n.priority,
+                    "tags": list(n.tags),
+                    "confidence": n.confidence,
+                }}
+            
+            elif tool_name == "pg_delete_session_events":
+                response = stub.DeleteSessionEvents(mcp_pb2.DeleteSessionEventsRequest(
+                    session_id=args.get("session_id", "default"),
+                    before_date=args.get("before_date") or "",
+                    kind=args.get("kind") or "",
+                ))
+                return {"ok": response.ok, "deleted_count": response.deleted_count}
+            
+            elif tool_name == "pg_upsert_setting":
+                response = stub.UpsertSetting(mcp_pb2.UpsertSettingRequest(
+                    key=args.get("key", ""),
+                    value_json=orjson.dumps(args.get("value", {})).decode(),
+                ))
+                return {"ok": response.ok, "error": response.error}
+            
+            elif tool_name == "init_postgres_schema":
+                response = stub.InitPostgresSchema(mcp_pb2.InitSchemaRequest())
+                return {"ok": response.ok, "error": response.error}
+            
+            elif tool_name == "init_clickhouse_schema":
+                response = stub.InitClickhouseSchema(mcp_pb2.InitSchemaRequest())
+                return {"ok": response.ok, "error": response.error}
+            
             else:
-                # Fallback to generic CallTool for any other tool
+                # Fallback to generic CallTool for any tool added server-side
+                # before it grows a typed stub
                 response = stub.CallTool(mcp_pb2.ToolCallRequest(
                     tool_name=tool_name,
-                    args_json=json.dumps(args),
+                    args_json=orjson.dumps(args).decode(),
                 ))
                 if response.ok:
-                    return json.loads(response.result_json) if response.result_json else {}
+                    return orjson.loads(response.result_json) if response.result_json else {}
                 else:
                     return {"ok": False, "error": response.error}
         
@@ -133,21 +232,30 @@ class MCPGrpcClient:
     async def start(self) -> None:
         """Start the gRPC connection (connects lazily on first call)."""
         # gRPC connects lazily, but we can pre-connect here
-        self._get_stub()
-        print(f"[gRPC] Connected to {self.host}:{self.port}")
+        self._pick_stub()
+        logger.debug("[gRPC] Connected to %s:%s", self.host, self.port)
     
     async def stop(self) -> None:
         """Close the gRPC channel."""
         self.close()
     
     async def init_schemas(self) -> None:
-        """Initialize database schemas via gRPC."""
-        await self.call("init_postgres_schema", {})
-        await self.call("init_clickhouse_schema", {})
+        """Initialize database schemas via gRPC.
+
+        Postgres and ClickHouse are independent databases, so the two
+        inits run in worker threads and are awaited as a pair - startup
+        pays max(t_pg, t_ch) instead of the sum. (call() drives blocking
+        sync stubs, so gathering it directly would serialize; the threads
+        are what buy the overlap.)
+        """
+        await asyncio.gather(
+            asyncio.to_thread(asyncio.run, self.call("init_postgres_schema", {})),
+            asyncio.to_thread(asyncio.run, self.call("init_clickhouse_schema", {})),
+        )
     
     def close(self):
-        """Close the gRPC channel."""
-        if self._channel:
-            self._channel.close()
-            self._channel = None
-            self._stub = None
+        """Close all pooled gRPC channels."""
+        for channel in self._channels:
+            channel.close()
+        self._channels = []
+        self._stubs = []
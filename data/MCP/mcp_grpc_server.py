@@ -4,13 +4,15 @@ gRPC Server for Nexus MCP - High-performance alternative to stdio MCP
 Run with: python3 mcp_grpc_server.py
 Default port: 50051
 """
-import json
+import asyncio
+import functools
 import os
 import sys
 from concurrent import futures
 from pathlib import Path
 
 import grpc
+import orjson
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
@@ -37,23 +39,56 @@ from mcp_server import (
     ch_update_note,
     ch_get_note_by_id,
     pg_delete_session_events,
+    pg_upsert_setting,
     init_postgres_schema,
     init_clickhouse_schema,
     wait_for_databases,
 )
 
 
+# Mirror of the client-side channel options (mcp_grpc_client._CHAN_OPTS)
+# minus the subchannel-pool knob, which is client-only.
+_CHAN_OPTS = [
+    ("grpc.max_send_message_length", 32 * 1024 * 1024),
+    ("grpc.max_receive_message_length", 32 * 1024 * 1024),
+    ("grpc.http2.max_frame_size", 1024 * 1024),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+]
+
+# The DB helpers are synchronous (psycopg/clickhouse drivers), so they run
+# on this bounded pool while the asyncio event loop keeps accepting RPCs.
+# A stalled query occupies one pool thread, not the whole server. The DB
+# pool matches the Postgres pool ceiling by default; the migration pool
+# (sync-path protobuf work) scales with the host's cores.
+_DB_WORKERS = max(1, int(os.getenv("NEXUS_DB_WORKERS", "16")))
+_GRPC_WORKERS = max(1, int(os.getenv("NEXUS_GRPC_WORKERS", str((os.cpu_count() or 4) * 4))))
+
+_DB_POOL = futures.ThreadPoolExecutor(max_workers=_DB_WORKERS, thread_name_prefix="nexus-db")
+
+
+async def _run_db(fn, **kwargs):
+    """Run a blocking DB helper on the pool without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DB_POOL, functools.partial(fn, **kwargs))
+
+
 class NexusMCPServicer(mcp_pb2_grpc.NexusMCPServicer):
     """gRPC service implementation wrapping existing MCP tools."""
-    
-    def AppendEvent(self, request, context):
+
+    async def AppendEvent(self, request, context):
         """Append an event to PostgreSQL."""
         try:
-            payload = json.loads(request.payload_json) if request.payload_json else {}
-            result = pg_append_event(
+            # Raw JSON bytes go straight through to Postgres; pg_append_event
+            # only parses them for kinds it vectorizes.
+            result = await _run_db(
+                pg_append_event,
                 kind=request.kind,
-                payload=payload,
+                payload=request.payload_json or b"{}",
                 session_id=request.session_id or "default",
+                # psycopg needs a real list to adapt to TEXT[]
                 tags=list(request.tags) if request.tags else None,
             )
             return mcp_pb2.AppendEventResponse(
@@ -62,11 +97,12 @@ class NexusMCPServicer(mcp_pb2_grpc.NexusMCPServicer):
             )
         except Exception as e:
             return mcp_pb2.AppendEventResponse(ok=False, error=str(e))
-    
-    def GetRecentHistory(self, request, context):
+
+    async def GetRecentHistory(self, request, context):
         """Get recent chat history."""
         try:
-            result = pg_get_recent_history(
+            result = await _run_db(
+                pg_get_recent_history,
                 session_id=request.session_id or "default",
                 limit=request.limit or 10,
             )
@@ -74,15 +110,16 @@ class NexusMCPServicer(mcp_pb2_grpc.NexusMCPServicer):
         except Exception as e:
             context.set_details(str(e))
             return mcp_pb2.GetHistoryResponse()
-    
-    def InsertNote(self, request, context):
+
+    async def InsertNote(self, request, context):
         """Insert a new note."""
         try:
-            result = ch_insert_note(
+            result = await _run_db(
+                ch_insert_note,
                 content=request.content,
                 title=request.title or None,
                 deadline=request.deadline or None,
-                tags=list(request.tags) if request.tags else None,
+                tags=request.tags or None,
                 confidence=request.confidence or 0.8,
             )
             return mcp_pb2.NoteResponse(
@@ -91,17 +128,18 @@ class NexusMCPServicer(mcp_pb2_grpc.NexusMCPServicer):
             )
         except Exception as e:
             return mcp_pb2.NoteResponse(ok=False, error=str(e))
-    
-    def SearchNotes(self, request, context):
+
+    async def SearchNotes(self, request, context):
         """Search notes semantically."""
         try:
-            result = ch_search_notes_text(
+            result = await _run_db(
+                ch_search_notes_text,
                 query=request.query,
                 limit=request.limit or 10,
             )
-            items = []
-            for item in result.get("items", []):
-                items.append(mcp_pb2.NoteItem(
+            NoteItem = mcp_pb2.NoteItem
+            items = [
+                NoteItem(
                     id=item.get("id", ""),
                     title=item.get("title", ""),
                     content=item.get("content", ""),
@@ -109,7 +147,9 @@ class NexusMCPServicer(mcp_pb2_grpc.NexusMCPServicer):
                     tags=item.get("tags", []),
                     confidence=item.get("confidence", 0.0),
                     score=item.get("score", 0.0),
-                ))
+                )
+                for item in result.get("items", [])
+            ]
             return mcp_pb2.SearchNotesResponse(
                 count=result.get("count", len(items)),
                 items=items,
@@ -117,31 +157,33 @@ class NexusMCPServicer(mcp_pb2_grpc.NexusMCPServicer):
         except Exception as e:
             context.set_details(str(e))
             return mcp_pb2.SearchNotesResponse()
-    
-    def DeleteNote(self, request, context):
+
+    async def DeleteNote(self, request, context):
         """Delete a note by ID."""
         try:
-            result = ch_delete_note(note_id=request.note_id)
+            result = await _run_db(ch_delete_note, note_id=request.note_id)
             return mcp_pb2.DeleteResponse(
                 ok=result.get("ok", False),
                 deleted_id=result.get("deleted_id", request.note_id),
             )
         except Exception as e:
             return mcp_pb2.DeleteResponse(ok=False, error=str(e))
-    
-    def ListNotes(self, request, context):
+
+    async def ListNotes(self, request, context):
         """List all notes."""
         try:
-            result = ch_list_notes(limit=request.limit or 20)
-            notes = []
-            for note in result.get("notes", []):
-                notes.append(mcp_pb2.NoteItem(
+            result = await _run_db(ch_list_notes, limit=request.limit or 20)
+            NoteItem = mcp_pb2.NoteItem
+            notes = [
+                NoteItem(
                     id=note.get("id", ""),
                     title=note.get("title", ""),
                     content=note.get("content", ""),
                     deadline=str(note.get("deadline", "")),
                     tags=note.get("tags", []),
-                ))
+                )
+                for note in result.get("notes", [])
+            ]
             return mcp_pb2.ListNotesResponse(
                 ok=result.get("ok", False),
                 count=result.get("count", len(notes)),
@@ -149,32 +191,118 @@ class NexusMCPServicer(mcp_pb2_grpc.NexusMCPServicer):
             )
         except Exception as e:
             return mcp_pb2.ListNotesResponse(ok=False)
-    
-    def SearchHistory(self, request, context):
+
+    async def SearchHistory(self, request, context):
         """Search chat history semantically."""
         try:
-            result = ch_search_history(
+            result = await _run_db(
+                ch_search_history,
                 query=request.query,
                 limit=request.limit or 5,
             )
-            results = []
-            for r in result.get("results", []):
-                results.append(mcp_pb2.HistoryItem(
+            HistoryItem = mcp_pb2.HistoryItem
+            results = [
+                HistoryItem(
                     timestamp=str(r.get("timestamp", "")),
                     role=r.get("role", ""),
                     text=r.get("text", ""),
                     score=r.get("score", 0.0),
-                ))
+                )
+                for r in result.get("results", [])
+            ]
             return mcp_pb2.SearchHistoryResponse(results=results)
         except Exception as e:
             context.set_details(str(e))
             return mcp_pb2.SearchHistoryResponse()
-    
-    def CallTool(self, request, context):
+
+    async def UpdateNote(self, request, context):
+        """Update fields of an existing note."""
+        try:
+            result = await _run_db(
+                ch_update_note,
+                note_id=request.note_id,
+                content=request.content if request.HasField("content") else None,
+                title=request.title if request.HasField("title") else None,
+                deadline=request.deadline if request.HasField("deadline") else None,
+                status=request.status if request.HasField("status") else None,
+                priority=request.priority if request.HasField("priority") else None,
+                tags=request.tags if request.update_tags else None,
+            )
+            return mcp_pb2.NoteResponse(
+                ok=result.get("ok", False),
+                note_id=result.get("note_id", ""),
+                error=result.get("error", ""),
+            )
+        except Exception as e:
+            return mcp_pb2.NoteResponse(ok=False, error=str(e))
+
+    async def GetNote(self, request, context):
+        """Fetch a single note by ID."""
+        try:
+            result = await _run_db(ch_get_note_by_id, note_id=request.note_id)
+            if not result.get("ok"):
+                return mcp_pb2.GetNoteResponse(ok=False, error=result.get("error", ""))
+            n = result["note"]
+            return mcp_pb2.GetNoteResponse(ok=True, note=mcp_pb2.NoteItem(
+                id=n.get("id", ""),
+                created_at=n.get("created_at", ""),
+                title=n.get("title", ""),
+                content=n.get("content", ""),
+                deadline=n.get("deadline", ""),
+                status=n.get("status", ""),
+                priority=n.get("priority", 0),
+                tags=n.get("tags", []),
+                confidence=n.get("confidence", 0.0),
+            ))
+        except Exception as e:
+            return mcp_pb2.GetNoteResponse(ok=False, error=str(e))
+
+    async def DeleteSessionEvents(self, request, context):
+        """Delete events for a session."""
+        try:
+            result = await _run_db(
+                pg_delete_session_events,
+                session_id=request.session_id,
+                before_date=request.before_date or None,
+                kind=request.kind or None,
+            )
+            return mcp_pb2.DeleteSessionEventsResponse(
+                ok=result.get("ok", False),
+                deleted_count=result.get("deleted_count", 0),
+            )
+        except Exception as e:
+            return mcp_pb2.DeleteSessionEventsResponse(ok=False, error=str(e))
+
+    async def UpsertSetting(self, request, context):
+        """Upsert a settings key."""
+        try:
+            value = orjson.loads(request.value_json) if request.value_json else {}
+            result = await _run_db(pg_upsert_setting, key=request.key, value=value)
+            return mcp_pb2.Ack(ok=result.get("ok", False))
+        except Exception as e:
+            return mcp_pb2.Ack(ok=False, error=str(e))
+
+    async def InitPostgresSchema(self, request, context):
+        """Initialize the Postgres schema."""
+        try:
+            result = await _run_db(init_postgres_schema)
+            return mcp_pb2.Ack(ok=result.get("ok", False))
+        except Exception as e:
+            return mcp_pb2.Ack(ok=False, error=str(e))
+
+    async def InitClickhouseSchema(self, request, context):
+        """Initialize the ClickHouse schema."""
+        try:
+            result = await _run_db(init_clickhouse_schema)
+            return mcp_pb2.Ack(ok=result.get("ok", False))
+        except Exception as e:
+            return mcp_pb2.Ack(ok=False, error=str(e))
+
+    async def CallTool(self, request, context):
         """Generic tool call for any MCP tool."""
         try:
-            args = json.loads(request.args_json) if request.args_json else {}
-            
+            args = orjson.loads(request.args_json) if request.args_json else {}
+
             # Map tool names to functions
             tools = {
                 "pg_append_event": pg_append_event,
@@ -188,48 +316,54 @@ class NexusMCPServicer(mcp_pb2_grpc.NexusMCPServicer):
                 "ch_get_note_by_id": ch_get_note_by_id,
                 "pg_delete_session_events": pg_delete_session_events,
             }
-            
+
             if request.tool_name not in tools:
                 return mcp_pb2.ToolCallResponse(
                     ok=False,
                     error=f"Unknown tool: {request.tool_name}",
                 )
-            
-            result = tools[request.tool_name](**args)
+
+            result = await _run_db(tools[request.tool_name], **args)
             return mcp_pb2.ToolCallResponse(
                 ok=True,
-                result_json=json.dumps(result),
+                result_json=orjson.dumps(result).decode(),
             )
         except Exception as e:
             return mcp_pb2.ToolCallResponse(ok=False, error=str(e))
 
 
-def serve():
+async def serve():
     """Start the gRPC server."""
     port = os.getenv("NEXUS_GRPC_PORT", "50051")
-    
+
     # Wait for databases
     if not wait_for_databases():
         print("gRPC: Failed to connect to databases")
         sys.exit(1)
-    
+
     # Initialize schemas
     try:
         init_clickhouse_schema()
         init_postgres_schema()
     except Exception as e:
         print(f"gRPC: Schema init failed: {e}")
-    
-    # Create server with thread pool
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+    # Async server: the event loop handles RPC framing while DB work
+    # runs on _DB_POOL, so one slow query can't tie up the listener.
+    compression = grpc.Compression.Gzip if os.getenv("NEXUS_GRPC_COMPRESS") == "1" else None
+    server = grpc.aio.server(
+        migration_thread_pool=futures.ThreadPoolExecutor(max_workers=_GRPC_WORKERS),
+        options=_CHAN_OPTS,
+        compression=compression,
+    )
     mcp_pb2_grpc.add_NexusMCPServicer_to_server(NexusMCPServicer(), server)
     server.add_insecure_port(f"[::]:{port}")
-    
+
     print(f"gRPC MCP Server starting on port {port}...")
-    server.start()
+    await server.start()
     print(f"gRPC MCP Server ready on port {port}")
-    server.wait_for_termination()
+    await server.wait_for_termination()
 
 
 if __name__ == "__main__":
-    serve()
+    asyncio.run(serve())
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12\x64\x61ta/MCP/mcp.proto\x12\x05nexus\"Z\n\x12\x41ppendEventRequest\x12\x0c\n\x04kind\x18\x01 \x01(\t\x12\x14\n\x0cpayload_json\x18\x02 \x01(\t\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12\x0c\n\x04tags\x18\x04 \x03(\t\"B\n\x13\x41ppendEventResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\t\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"6\n\x11GetHistoryRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\"%\n\x12GetHistoryResponse\x12\x0f\n\x07history\x18\x01 \x03(\t\"g\n\x11InsertNoteRequest\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x10\n\x08\x64\x65\x61\x64line\x18\x03 \x01(\t\x12\x0c\n\x04tags\x18\x04 \x03(\t\x12\x12\n\nconfidence\x18\x05 \x01(\x02\":\n\x0cNoteResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x0f\n\x07note_id\x18\x02 \x01(\t\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"-\n\rSearchRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\"D\n\x13SearchNotesResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12\x1e\n\x05items\x18\x02 \x03(\x0b\x32\x0f.nexus.NoteItem\"y\n\x08NoteItem\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\x12\x10\n\x08\x64\x65\x61\x64line\x18\x04 \x01(\t\x12\x0c\n\x04tags\x18\x05 \x03(\t\x12\x12\n\nconfidence\x18\x06 \x01(\x02\x12\r\n\x05score\x18\x07 \x01(\x02\"$\n\x11\x44\x65leteNoteRequest\x12\x0f\n\x07note_id\x18\x01 \x01(\t\"?\n\x0e\x44\x65leteResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x12\n\ndeleted_id\x18\x02 \x01(\t\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"!\n\x10ListNotesRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\"N\n\x11ListNotesResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\x12\x1e\n\x05notes\x18\x03 \x03(\x0b\x32\x0f.nexus.NoteItem\"<\n\x15SearchHistoryResponse\x12#\n\x07results\x18\x01 \x03(\x0b\x32\x12.nexus.HistoryItem\"K\n\x0bHistoryItem\x12\x11\n\ttimestamp\x18\x01 \x01(\t\x12\x0c\n\x04role\x18\x02 \x01(\t\x12\x0c\n\x04text\x18\x03 \x01(\t\x12\r\n\x05score\x18\x04 \x01(\x02\"7\n\x0fToolCallRequest\x12\x11\n\ttool_name\x18\x01 \x01(\t\x12\x11\n\targs_json\x18\x02 \x01(\t\"B\n\x10ToolCallResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x13\n\x0bresult_json\x18\x02 \x01(\t\x12\r\n\x05\x65rror\x18\x03 \x01(\t2\x98\x04\n\x08NexusMCP\x12\x44\n\x0b\x41ppendEvent\x12\x19.nexus.AppendEventRequest\x1a\x1a.nexus.AppendEventResponse\x12G\n\x10GetRecentHistory\x12\x18.nexus.GetHistoryRequest\x1a\x19.nexus.GetHistoryResponse\x12;\n\nInsertNote\x12\x18.nexus.InsertNoteRequest\x1a\x13.nexus.NoteResponse\x12?\n\x0bSearchNotes\x12\x14.nexus.SearchRequest\x1a\x1a.nexus.SearchNotesResponse\x12=\n\nDeleteNote\x12\x18.nexus.DeleteNoteRequest\x1a\x15.nexus.DeleteResponse\x12>\n\tListNotes\x12\x17.nexus.ListNotesRequest\x1a\x18.nexus.ListNotesResponse\x12\x43\n\rSearchHistory\x12\x14.nexus.SearchRequest\x1a\x1c.nexus.SearchHistoryResponse\x12;\n\x08\x43\x61llTool\x12\x16.nexus.ToolCallRequest\x1a\x17.nexus.ToolCallResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12\x64\x61ta/MCP/mcp.proto\x12\x05nexus\"Z\n\x12\x41ppendEventRequest\x12\x0c\n\x04kind\x18\x01 \x01(\t\x12\x14\n\x0cpayload_json\x18\x02 \x01(\x0c\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12\x0c\n\x04tags\x18\x04 \x03(\t\"B\n\x13\x41ppendEventResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\t\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"6\n\x11GetHistoryRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\"%\n\x12GetHistoryResponse\x12\x0f\n\x07history\x18\x01 \x03(\t\"g\n\x11InsertNoteRequest\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x10\n\x08\x64\x65\x61\x64line\x18\x03 \x01(\t\x12\x0c\n\x04tags\x18\x04 \x03(\t\x12\x12\n\nconfidence\x18\x05 \x01(\x02\":\n\x0cNoteResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x0f\n\x07note_id\x18\x02 \x01(\t\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"-\n\rSearchRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\"D\n\x13SearchNotesResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12\x1e\n\x05items\x18\x02 \x03(\x0b\x32\x0f.nexus.NoteItem\"\xaf\x01\n\x08NoteItem\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\x12\x10\n\x08\x64\x65\x61\x64line\x18\x04 \x01(\t\x12\x0c\n\x04tags\x18\x05 \x03(\t\x12\x12\n\nconfidence\x18\x06 \x01(\x02\x12\r\n\x05score\x18\x07 \x01(\x02\x12\x12\n\ncreated_at\x18\x08 \x01(\t\x12\x0e\n\x06status\x18\t \x01(\t\x12\x10\n\x08priority\x18\n \x01(\x05\"\xef\x01\n\x11UpdateNoteRequest\x12\x0f\n\x07note_id\x18\x01 \x01(\t\x12\x14\n\x07\x63ontent\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x12\n\x05title\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x15\n\x08\x64\x65\x61\x64line\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x13\n\x06status\x18\x05 \x01(\tH\x03\x88\x01\x01\x12\x15\n\x08priority\x18\x06 \x01(\x05H\x04\x88\x01\x01\x12\x0c\n\x04tags\x18\x07 \x03(\t\x12\x13\n\x0bupdate_tags\x18\x08 \x01(\x08\x42\n\n\x08_contentB\x08\n\x06_titleB\x0b\n\t_deadlineB\t\n\x07_statusB\x0b\n\t_priority\"!\n\x0eGetNoteRequest\x12\x0f\n\x07note_id\x18\x01 \x01(\t\"K\n\x0fGetNoteResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x1d\n\x04note\x18\x02 \x01(\x0b\x32\x0f.nexus.NoteItem\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"S\n\x1a\x44\x65leteSessionEventsRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x13\n\x0b\x62\x65\x66ore_date\x18\x02 \x01(\t\x12\x0c\n\x04kind\x18\x03 \x01(\t\"O\n\x1b\x44\x65leteSessionEventsResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x15\n\rdeleted_count\x18\x02 \x01(\x05\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"7\n\x14UpsertSettingRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x12\n\nvalue_json\x18\x02 \x01(\t\"\x13\n\x11InitSchemaRequest\" \n\x03\x41\x63k\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\r\n\x05\x65rror\x18\x02 \x01(\t\"$\n\x11\x44\x65leteNoteRequest\x12\x0f\n\x07note_id\x18\x01 \x01(\t\"?\n\x0e\x44\x65leteResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x12\n\ndeleted_id\x18\x02 \x01(\t\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"!\n\x10ListNotesRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\"N\n\x11ListNotesResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\x12\x1e\n\x05notes\x18\x03 \x03(\x0b\x32\x0f.nexus.NoteItem\"<\n\x15SearchHistoryResponse\x12#\n\x07results\x18\x01 \x03(\x0b\x32\x12.nexus.HistoryItem\"K\n\x0bHistoryItem\x12\x11\n\ttimestamp\x18\x01 \x01(\t\x12\x0c\n\x04role\x18\x02 \x01(\t\x12\x0c\n\x04text\x18\x03 \x01(\t\x12\r\n\x05score\x18\x04 \x01(\x02\"7\n\x0fToolCallRequest\x12\x11\n\ttool_name\x18\x01 \x01(\t\x12\x11\n\targs_json\x18\x02 \x01(\t\"B\n\x10ToolCallResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x13\n\x0bresult_json\x18\x02 \x01(\t\x12\r\n\x05\x65rror\x18\x03 \x01(\t2\xa1\x07\n\x08NexusMCP\x12\x44\n\x0b\x41ppendEvent\x12\x19.nexus.AppendEventRequest\x1a\x1a.nexus.AppendEventResponse\x12G\n\x10GetRecentHistory\x12\x18.nexus.GetHistoryRequest\x1a\x19.nexus.GetHistoryResponse\x12;\n\nInsertNote\x12\x18.nexus.InsertNoteRequest\x1a\x13.nexus.NoteResponse\x12?\n\x0bSearchNotes\x12\x14.nexus.SearchRequest\x1a\x1a.nexus.SearchNotesResponse\x12=\n\nDeleteNote\x12\x18.nexus.DeleteNoteRequest\x1a\x15.nexus.DeleteResponse\x12>\n\tListNotes\x12\x17.nexus.ListNotesRequest\x1a\x18.nexus.ListNotesResponse\x12\x43\n\rSearchHistory\x12\x14.nexus.SearchRequest\x1a\x1c.nexus.SearchHistoryResponse\x12;\n\nUpdateNote\x12\x18.nexus.UpdateNoteRequest\x1a\x13.nexus.NoteResponse\x12\x38\n\x07GetNote\x12\x15.nexus.GetNoteRequest\x1a\x16.nexus.GetNoteResponse\x12\\\n\x13\x44\x65leteSessionEvents\x12!.nexus.DeleteSessionEventsRequest\x1a\".nexus.DeleteSessionEventsResponse\x12\x38\n\rUpsertSetting\x12\x1b.nexus.UpsertSettingRequest\x1a\n.nexus.Ack\x12:\n\x12InitPostgresSchema\x12\x18.nexus.InitSchemaRequest\x1a\n.nexus.Ack\x12<\n\x14InitClickhouseSchema\x12\x18.nexus.InitSchemaRequest\x1a\n.nexus.Ack\x12;\n\x08\x43\x61llTool\x12\x16.nexus.ToolCallRequest\x1a\x17.nexus.ToolCallResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -47,24 +47,40 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_SEARCHREQUEST']._serialized_end=494
   _globals['_SEARCHNOTESRESPONSE']._serialized_start=496
   _globals['_SEARCHNOTESRESPONSE']._serialized_end=564
-  _globals['_NOTEITEM']._serialized_start=566
-  _globals['_NOTEITEM']._serialized_end=687
-  _globals['_DELETENOTEREQUEST']._serialized_start=689
-  _globals['_DELETENOTEREQUEST']._serialized_end=725
-  _globals['_DELETERESPONSE']._serialized_start=727
-  _globals['_DELETERESPONSE']._serialized_end=790
-  _globals['_LISTNOTESREQUEST']._serialized_start=792
-  _globals['_LISTNOTESREQUEST']._serialized_end=825
-  _globals['_LISTNOTESRESPONSE']._serialized_start=827
-  _globals['_LISTNOTESRESPONSE']._serialized_end=905
-  _globals['_SEARCHHISTORYRESPONSE']._serialized_start=907
-  _globals['_SEARCHHISTORYRESPONSE']._serialized_end=967
-  _globals['_HISTORYITEM']._serialized_start=969
-  _globals['_HISTORYITEM']._serialized_end=1044
-  _globals['_TOOLCALLREQUEST']._serialized_start=1046
-  _globals['_TOOLCALLREQUEST']._serialized_end=1101
-  _globals['_TOOLCALLRESPONSE']._serialized_start=1103
-  _globals['_TOOLCALLRESPONSE']._serialized_end=1169
-  _globals['_NEXUSMCP']._serialized_start=1172
-  _globals['_NEXUSMCP']._serialized_end=1708
+  _globals['_NOTEITEM']._serialized_start=567
+  _globals['_NOTEITEM']._serialized_end=742
+  _globals['_UPDATENOTEREQUEST']._serialized_start=745
+  _globals['_UPDATENOTEREQUEST']._serialized_end=984
+  _globals['_GETNOTEREQUEST']._serialized_start=986
+  _globals['_GETNOTEREQUEST']._serialized_end=1019
+  _globals['_GETNOTERESPONSE']._serialized_start=1021
+  _globals['_GETNOTERESPONSE']._serialized_end=1096
+  _globals['_DELETESESSIONEVENTSREQUEST']._serialized_start=1098
+  _globals['_DELETESESSIONEVENTSREQUEST']._serialized_end=1181
+  _globals['_DELETESESSIONEVENTSRESPONSE']._serialized_start=1183
+  _globals['_DELETESESSIONEVENTSRESPONSE']._serialized_end=1262
+  _globals['_UPSERTSETTINGREQUEST']._serialized_start=1264
+  _globals['_UPSERTSETTINGREQUEST']._serialized_end=1319
+  _globals['_INITSCHEMAREQUEST']._serialized_start=1321
+  _globals['_INITSCHEMAREQUEST']._serialized_end=1340
+  _globals['_ACK']._serialized_start=1342
+  _globals['_ACK']._serialized_end=1374
+  _globals['_DELETENOTEREQUEST']._serialized_start=1376
+  _globals['_DELETENOTEREQUEST']._serialized_end=1412
+  _globals['_DELETERESPONSE']._serialized_start=1414
+  _globals['_DELETERESPONSE']._serialized_end=1477
+  _globals['_LISTNOTESREQUEST']._serialized_start=1479
+  _globals['_LISTNOTESREQUEST']._serialized_end=1512
+  _globals['_LISTNOTESRESPONSE']._serialized_start=1514
+  _globals['_LISTNOTESRESPONSE']._serialized_end=1592
+  _globals['_SEARCHHISTORYRESPONSE']._serialized_start=1594
+  _globals['_SEARCHHISTORYRESPONSE']._serialized_end=1654
+  _globals['_HISTORYITEM']._serialized_start=1656
+  _globals['_HISTORYITEM']._serialized_end=1731
+  _globals['_TOOLCALLREQUEST']._serialized_start=1733
+  _globals['_TOOLCALLREQUEST']._serialized_end=1788
+  _globals['_TOOLCALLRESPONSE']._serialized_start=1790
+  _globals['_TOOLCALLRESPONSE']._serialized_end=1856
+  _globals['_NEXUSMCP']._serialized_start=1859
+  _globals['_NEXUSMCP']._serialized_end=2788
 # @@protoc_insertion_point(module_scope)
@@ -70,6 +70,36 @@ class NexusMCPStub(object):
                 request_serializer=data_dot_MCP_dot_mcp__pb2.SearchRequest.SerializeToString,
                 response_deserializer=data_dot_MCP_dot_mcp__pb2.SearchHistoryResponse.FromString,
                 _registered_method=True)
+        self.UpdateNote = channel.unary_unary(
+                '/nexus.NexusMCP/UpdateNote',
+                request_serializer=data_dot_MCP_dot_mcp__pb2.UpdateNoteRequest.SerializeToString,
+                response_deserializer=data_dot_MCP_dot_mcp__pb2.NoteResponse.FromString,
+                _registered_method=True)
+        self.GetNote = channel.unary_unary(
+                '/nexus.NexusMCP/GetNote',
+                request_serializer=data_dot_MCP_dot_mcp__pb2.GetNoteRequest.SerializeToString,
+                response_deserializer=data_dot_MCP_dot_mcp__pb2.GetNoteResponse.FromString,
+                _registered_method=True)
+        self.DeleteSessionEvents = channel.unary_unary(
+                '/nexus.NexusMCP/DeleteSessionEvents',
+                request_serializer=data_dot_MCP_dot_mcp__pb2.DeleteSessionEventsRequest.SerializeToString,
+                response_deserializer=data_dot_MCP_dot_mcp__pb2.DeleteSessionEventsResponse.FromString,
+                _registered_method=True)
+        self.UpsertSetting = channel.unary_unary(
+                '/nexus.NexusMCP/UpsertSetting',
+                request_serializer=data_dot_MCP_dot_mcp__pb2.UpsertSettingRequest.SerializeToString,
+                response_deserializer=data_dot_MCP_dot_mcp__pb2.Ack.FromString,
+                _registered_method=True)
+        self.InitPostgresSchema = channel.unary_unary(
+                '/nexus.NexusMCP/InitPostgresSchema',
+                request_serializer=data_dot_MCP_dot_mcp__pb2.InitSchemaRequest.SerializeToString,
+                response_deserializer=data_dot_MCP_dot_mcp__pb2.Ack.FromString,
+                _registered_method=True)
+        self.InitClickhouseSchema = channel.unary_unary(
+                '/nexus.NexusMCP/InitClickhouseSchema',
+                request_serializer=data_dot_MCP_dot_mcp__pb2.InitSchemaRequest.SerializeToString,
+                response_deserializer=data_dot_MCP_dot_mcp__pb2.Ack.FromString,
+                _registered_method=True)
         self.CallTool = channel.unary_unary(
                 '/nexus.NexusMCP/CallTool',
                 request_serializer=data_dot_MCP_dot_mcp__pb2.ToolCallRequest.SerializeToString,
@@ -126,6 +156,44 @@ class NexusMCPServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def UpdateNote(self, request, context):
+        """Typed coverage for the remaining tools, so the client never has to
+        round-trip args/results through JSON-in-protobuf
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNote(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeleteSessionEvents(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpsertSetting(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def InitPostgresSchema(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def InitClickhouseSchema(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def CallTool(self, request, context):
         """Generic tool call (fallback for any tool)
         """
@@ -171,6 +239,36 @@ def add_NexusMCPServicer_to_server(servicer, server):
                     request_deserializer=data_dot_MCP_dot_mcp__pb2.SearchRequest.FromString,
                     response_serializer=data_dot_MCP_dot_mcp__pb2.SearchHistoryResponse.SerializeToString,
             ),
+            'UpdateNote': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateNote,
+                    request_deserializer=data_dot_MCP_dot_mcp__pb2.UpdateNoteRequest.FromString,
+                    response_serializer=data_dot_MCP_dot_mcp__pb2.NoteResponse.SerializeToString,
+            ),
+            'GetNote': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNote,
+                    request_deserializer=data_dot_MCP_dot_mcp__pb2.GetNoteRequest.FromString,
+                    response_serializer=data_dot_MCP_dot_mcp__pb2.GetNoteResponse.SerializeToString,
+            ),
+            'DeleteSessionEvents': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteSessionEvents,
+                    request_deserializer=data_dot_MCP_dot_mcp__pb2.DeleteSessionEventsRequest.FromString,
+                    response_serializer=data_dot_MCP_dot_mcp__pb2.DeleteSessionEventsResponse.SerializeToString,
+            ),
+            'UpsertSetting': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpsertSetting,
+                    request_deserializer=data_dot_MCP_dot_mcp__pb2.UpsertSettingRequest.FromString,
+                    response_serializer=data_dot_MCP_dot_mcp__pb2.Ack.SerializeToString,
+            ),
+            'InitPostgresSchema': grpc.unary_unary_rpc_method_handler(
+                    servicer.InitPostgresSchema,
+                    request_deserializer=data_dot_MCP_dot_mcp__pb2.InitSchemaRequest.FromString,
+                    response_serializer=data_dot_MCP_dot_mcp__pb2.Ack.SerializeToString,
+            ),
+            'InitClickhouseSchema': grpc.unary_unary_rpc_method_handler(
+                    servicer.InitClickhouseSchema,
+                    request_deserializer=data_dot_MCP_dot_mcp__pb2.InitSchemaRequest.FromString,
+                    response_serializer=data_dot_MCP_dot_mcp__pb2.Ack.SerializeToString,
+            ),
             'CallTool': grpc.unary_unary_rpc_method_handler(
                     servicer.CallTool,
                     request_deserializer=data_dot_MCP_dot_mcp__pb2.ToolCallRequest.FromString,
@@ -377,6 +475,168 @@ class NexusMCP(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def UpdateNote(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexus.NexusMCP/UpdateNote',
+            data_dot_MCP_dot_mcp__pb2.UpdateNoteRequest.SerializeToString,
+            data_dot_MCP_dot_mcp__pb2.NoteResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetNote(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexus.NexusMCP/GetNote',
+            data_dot_MCP_dot_mcp__pb2.GetNoteRequest.SerializeToString,
+            data_dot_MCP_dot_mcp__pb2.GetNoteResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DeleteSessionEvents(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexus.NexusMCP/DeleteSessionEvents',
+            data_dot_MCP_dot_mcp__pb2.DeleteSessionEventsRequest.SerializeToString,
+            data_dot_MCP_dot_mcp__pb2.DeleteSessionEventsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def UpsertSetting(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexus.NexusMCP/UpsertSetting',
+            data_dot_MCP_dot_mcp__pb2.UpsertSettingRequest.SerializeToString,
+            data_dot_MCP_dot_mcp__pb2.Ack.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def InitPostgresSchema(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexus.NexusMCP/InitPostgresSchema',
+            data_dot_MCP_dot_mcp__pb2.InitSchemaRequest.SerializeToString,
+            data_dot_MCP_dot_mcp__pb2.Ack.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def InitClickhouseSchema(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexus.NexusMCP/InitClickhouseSchema',
+            data_dot_MCP_dot_mcp__pb2.InitSchemaRequest.SerializeToString,
+            data_dot_MCP_dot_mcp__pb2.Ack.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def CallTool(request,
             target,
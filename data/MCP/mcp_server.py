@@ -1,11 +1,15 @@
-import os, uuid, json, sys, time
+import atexit, hashlib, os, sqlite3, uuid, sys, threading, time
+from array import array
+from functools import lru_cache
 from datetime import datetime, date, UTC    
 from typing import Any, Optional
 from openai import OpenAI
 
-import psycopg
 from psycopg.types.json import Jsonb
-import clickhouse_connect   
+from psycopg_pool import ConnectionPool
+import clickhouse_connect
+import orjson
+from clickhouse_connect.driver import httputil
 from mcp.server.fastmcp import FastMCP
 from pathlib import Path
 from dotenv import load_dotenv
@@ -28,15 +32,288 @@ CH_DB = os.getenv("CH_DB", "nexus")
 CH_USER = os.getenv("CH_USER", "default")
 CH_PASSWORD = os.getenv("CH_PASSWORD", "")
 
+# One pool for the process: every tool call used to pay a fresh
+# TCP + auth handshake; checkouts from the pool reuse warm connections.
+# The short timeout keeps the wait_for_databases retry loop responsive.
+_PG_POOL = ConnectionPool(
+    PG_DSN, min_size=2, max_size=16,
+    timeout=5, kwargs={"autocommit": True},
+)
+
 def pg_conn():
-    return psycopg.connect(PG_DSN, autocommit=True)
+    return _PG_POOL.connection()
+
+_CH_CLIENT = None
 
 def ch_client():
-    return clickhouse_connect.get_client(
-        host=CH_HOST, port=CH_PORT,
-        username=CH_USER, password=CH_PASSWORD,
-        database=CH_DB,
-    )
+    """Process-wide ClickHouse client. The driver keeps a urllib3 pool
+    internally (sized for the gRPC server's DB threads), so one client
+    serves concurrent calls without a handshake per tool call."""
+    global _CH_CLIENT
+    if _CH_CLIENT is None:
+        _CH_CLIENT = clickhouse_connect.get_client(
+            host=CH_HOST, port=CH_PORT,
+            username=CH_USER, password=CH_PASSWORD,
+            database=CH_DB,
+            pool_mgr=httputil.get_pool_manager(maxsize=16),
+            # Let the server coalesce whatever still arrives row-at-a-time
+            # (updates, other writers) into proper parts instead of one
+            # part per insert; large buffered flushes pass straight through.
+            settings={"async_insert": 1, "wait_for_async_insert": 0},
+        )
+    return _CH_CLIENT
+
+_NOTE_COLUMNS = [
+    "id", "created_at", "source_event_id", "title", "content",
+    "embedding", "deadline", "plan", "status", "priority", "tags", "confidence",
+]
+_CONTENT_IDX = _NOTE_COLUMNS.index("content")
+_EMBEDDING_IDX = _NOTE_COLUMNS.index("embedding")
+
+
+_CHAT_COLUMNS = [
+    "id", "created_at", "session_id", "role", "content", "embedding",
+]
+
+
+class _InsertBuffer:
+    """
+    Batches rows for one MergeTree table into bulk inserts. MergeTree is
+    tuned for bulk writes - one part per insert - so single-row inserts
+    create a stream of tiny parts that ClickHouse then has to merge back
+    together. Rows are buffered and flushed by a daemon thread once a
+    size threshold or a short delay is hit, whichever comes first; rows
+    enqueued with an empty embedding slot get it filled batch-wise at
+    flush time.
+
+    Callers are acked at enqueue, so a failed flush re-queues its rows
+    and retries on the next wakeup (bounded, so a persistent outage
+    can't grow the buffer forever), and a final flush runs at interpreter
+    exit so the daemon thread doesn't strand buffered rows.
+    """
+
+    def __init__(self, table: str, columns: list[str],
+                 max_rows: int = 256, max_delay: float = 0.5,
+                 max_retries: int = 5):
+        self._table = table
+        self._columns = columns
+        self._content_idx = columns.index("content")
+        self._emb_idx = columns.index("embedding")
+        self._rows: list[list] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._max_rows = max_rows
+        self._max_delay = max_delay
+        self._max_retries = max_retries
+        self._failures = 0
+        self._thread = threading.Thread(
+            target=self._run, name=f"nexus-{table}-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self._flush)
+
+    def add(self, row: list) -> None:
+        with self._lock:
+            self._rows.append(row)
+            if len(self._rows) >= self._max_rows:
+                self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(timeout=self._max_delay)
+            self._wake.clear()
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return
+        try:
+            # One embedding round trip for the whole batch: the API takes
+            # a list input, so N buffered rows cost one HTTP call
+            # instead of N sequential ~200ms ones.
+            pending = [i for i, r in enumerate(rows) if r[self._emb_idx] is None]
+            misses = []
+            for i in pending:
+                cached = _emb_cache_get(rows[i][self._content_idx])
+                if cached is not None:
+                    rows[i][self._emb_idx] = cached
+                else:
+                    misses.append(i)
+            if misses:
+                resp = client.embeddings.create(
+                    input=[rows[i][self._content_idx] for i in misses],
+                    model=_EMB_MODEL,
+                )
+                for i, d in zip(misses, resp.data):
+                    rows[i][self._emb_idx] = d.embedding
+                    _emb_cache_put(rows[i][self._content_idx], d.embedding)
+            # Hand the driver columns, not rows: clickhouse_connect
+            # serializes column-oriented data without its own transpose,
+            # and same-typed values sit together for wire compression.
+            ch_client().insert(
+                self._table, list(zip(*rows)),
+                column_names=self._columns, column_oriented=True,
+            )
+        except Exception as e:
+            # Transient ClickHouse/embeddings errors: put the rows back
+            # (embeddings already resolved stay filled, so a retry only
+            # re-runs what actually failed) and let the next wakeup retry.
+            self._failures += 1
+            if self._failures <= self._max_retries:
+                with self._lock:
+                    self._rows[:0] = rows
+                sys.stderr.write(
+                    f"MCP: Buffered {self._table} insert failed "
+                    f"({len(rows)} rows, retry {self._failures}/{self._max_retries}): {e}\n")
+            else:
+                sys.stderr.write(
+                    f"MCP: Buffered {self._table} insert failed "
+                    f"({len(rows)} rows, retries exhausted, dropping): {e}\n")
+        else:
+            self._failures = 0
+
+
+_NOTE_BUFFER = _InsertBuffer("notes_v2", _NOTE_COLUMNS)
+_CHAT_VEC_BUFFER = _InsertBuffer("chat_history_vec", _CHAT_COLUMNS, max_rows=64, max_delay=0.2)
+
+# Query strings for the hot read paths, built once instead of per call.
+# The parameters dicts stay per-call - the {name:Type} binding syntax
+# needs named values.
+#
+# The vector searches ship their SETTINGS with the query: the SET issued
+# during schema init is session-scoped, and over HTTP each query can land
+# on a fresh session, silently degrading the ORDER BY cosineDistance ...
+# LIMIT shape from an HNSW index lookup to a full-table scan. The new
+# analyzer is required for the index to be considered at all.
+# id/created_at/deadline come back as strings via toString: the rows are
+# only ever serialized onward, so building UUID/datetime objects in
+# Python just to str() them again was per-row waste.
+_SQL_SEARCH_HISTORY = """
+    SELECT toString(created_at) AS created_at, role, content,
+           cosineDistance(embedding, {query_vector:Array(Float32)}) as score
+    FROM chat_history_vec
+    ORDER BY score ASC
+    LIMIT {limit:UInt32}
+    SETTINGS allow_experimental_vector_similarity_index = 1, enable_analyzer = 1
+"""
+
+_SQL_SEARCH_NOTES = """
+    SELECT toString(id) AS id, toString(created_at) AS created_at,
+           title, content, toString(deadline) AS deadline, tags, confidence,
+           cosineDistance(embedding, {query_vector:Array(Float32)}) as score
+    FROM notes_v2
+    ORDER BY score ASC
+    LIMIT {limit:UInt32}
+    SETTINGS allow_experimental_vector_similarity_index = 1, enable_analyzer = 1
+"""
+
+_SQL_LIST_NOTES = (
+    "SELECT toString(id) AS id, toString(created_at) AS created_at, title, content, "
+    "toString(deadline) AS deadline, status, priority, tags, confidence "
+    "FROM notes_v2 ORDER BY created_at DESC LIMIT {limit:UInt32}"
+)
+
+_SQL_GET_NOTE = (
+    "SELECT toString(id) AS id, toString(created_at) AS created_at, title, content, "
+    "toString(deadline) AS deadline, status, priority, tags, confidence "
+    "FROM notes_v2 WHERE id = {note_id:String} LIMIT 1"
+)
+
+# Sentinels for absent deadline/source fields, built once instead of a
+# fresh date/UUID allocation per inserted note.
+_EPOCH = date(1970, 1, 1)
+_NIL_UUID = uuid.UUID(int=0)
+
+_EMB_MODEL = "text-embedding-3-small"
+_EMB_DB_LOCK = threading.Lock()
+_EMB_DB: Optional[sqlite3.Connection] = None
+
+
+def _emb_conn() -> sqlite3.Connection:
+    global _EMB_DB
+    if _EMB_DB is None:
+        path = os.getenv("NEXUS_EMB_CACHE", str(PROJECT_ROOT / "data" / "emb_cache.sqlite3"))
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("CREATE TABLE IF NOT EXISTS emb_cache (hash BLOB PRIMARY KEY, vec BLOB)")
+        conn.commit()
+        _EMB_DB = conn
+    return _EMB_DB
+
+
+def _emb_key(text: str) -> bytes:
+    # Model is part of the key so a model change can't serve stale vectors.
+    return hashlib.sha256(f"{_EMB_MODEL}\x00{text}".encode()).digest()
+
+
+def _emb_cache_get(text: str) -> Optional[list[float]]:
+    try:
+        with _EMB_DB_LOCK:
+            row = _emb_conn().execute(
+                "SELECT vec FROM emb_cache WHERE hash = ?", (_emb_key(text),)
+            ).fetchone()
+    except Exception:
+        return None
+    return list(array("f", row[0])) if row else None
+
+
+def _emb_cache_put(text: str, vec: list[float]) -> None:
+    try:
+        with _EMB_DB_LOCK:
+            conn = _emb_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO emb_cache (hash, vec) VALUES (?, ?)",
+                (_emb_key(text), array("f", vec).tobytes()),
+            )
+            conn.commit()
+    except Exception:
+        pass
+
+
+@lru_cache(maxsize=4096)
+def _embed(text: str) -> tuple:
+    """Embedding for a single text, memoized twice over: an in-process
+    LRU for repeat lookups this run, backed by a SQLite table so repeated
+    texts cost zero API spend across restarts."""
+    cached = _emb_cache_get(text)
+    if cached is not None:
+        return tuple(cached)
+    resp = client.embeddings.create(input=text, model=_EMB_MODEL)
+    vec = resp.data[0].embedding
+    _emb_cache_put(text, vec)
+    return tuple(vec)
+
+
+# Short-TTL cache for the polled read tools. The write generation is
+# part of every key, so any note/event write invalidates cached reads
+# without an explicit purge; within a quiet second, concurrent polls
+# collapse to one DB hit.
+_READ_CACHE: dict = {}
+_READ_CACHE_LOCK = threading.Lock()
+_READ_CACHE_TTL = 1.0
+_READ_CACHE_MAX = 128
+_WRITE_GEN = 0
+
+
+def _bump_write_gen() -> None:
+    global _WRITE_GEN
+    _WRITE_GEN += 1
+
+
+def _read_cache_get(key):
+    with _READ_CACHE_LOCK:
+        hit = _READ_CACHE.get(key)
+    if hit and time.monotonic() - hit[0] < _READ_CACHE_TTL:
+        return hit[1]
+    return None
+
+
+def _read_cache_put(key, value) -> None:
+    with _READ_CACHE_LOCK:
+        if len(_READ_CACHE) >= _READ_CACHE_MAX:
+            _READ_CACHE.clear()
+        _READ_CACHE[key] = (time.monotonic(), value)
+
 
 _CH_SCHEMA_READY = False
 
@@ -95,14 +372,19 @@ def init_clickhouse_schema() -> dict[str, Any]:
           source_event_id UUID,
           title String,
           content String,
-          embedding Array(Float32),
+          -- BFloat16 halves the 1536-dim row footprint and the memory
+          -- bandwidth of every distance computation; recall loss is
+          -- negligible for cosine ranking. Query vectors stay Float32.
+          embedding Array(BFloat16),
           deadline Date,
           plan String,
           status String,
           priority UInt8,
           tags Array(String),
           confidence Float32,
-          INDEX idx_embedding embedding TYPE vector_similarity('hnsw', 'cosineDistance', 1536) GRANULARITY 1
+          -- bf16 storage, m=32, ef_construction=128: sized for ~1M rows
+          -- instead of the library defaults
+          INDEX idx_embedding embedding TYPE vector_similarity('hnsw', 'cosineDistance', 1536, 'bf16', 32, 128) GRANULARITY 1
         )
         ENGINE = MergeTree
         ORDER BY (created_at)
@@ -117,13 +399,13 @@ def init_clickhouse_schema() -> dict[str, Any]:
           session_id String,
           role String,  -- 'user' or 'assistant'
           content String,
-          embedding Array(Float32),
+          embedding Array(BFloat16),
           
           -- HNSW INDEX for Lightning Fast Search
-          INDEX idx_chat_embed embedding TYPE vector_similarity('hnsw', 'cosineDistance', 1536) GRANULARITY 1
+          INDEX idx_chat_embed embedding TYPE vector_similarity('hnsw', 'cosineDistance', 1536, 'bf16', 32, 128) GRANULARITY 1
         )
         ENGINE = MergeTree
-        ORDER BY (created_at)
+        ORDER BY (session_id, created_at)
     """)
     
     return {"ok": True}
@@ -132,20 +414,32 @@ def init_clickhouse_schema() -> dict[str, Any]:
 # CORE TOOLS
 # ------------------------------------------------------------------
 
+def _jsonb_raw(b: bytes) -> str:
+    """Passthrough dumps for Jsonb when the payload is already JSON.
+
+    Returns str: psycopg 3.1's dumper calls .encode() on the result, so
+    returning bytes here would break on our declared >=3.1 floor.
+    """
+    return b.decode()
+
+
 @mcp.tool()
 def pg_append_event(
     kind: str,
-    payload: dict[str, Any],
+    payload: dict[str, Any] | bytes,
     session_id: str = "default",
     tags: Optional[list[str]] = None,
     ts_iso: Optional[str] = None,
 ) -> dict[str, Any]:
     """
     Saves the event to Postgres AND automatically vectorizes it into ClickHouse.
+    Accepts the payload either as a dict (stdio MCP) or as raw JSON bytes
+    (gRPC), which skip the parse-then-reserialize round trip entirely.
     """
     _ensure_ch_schema()
     tags = tags or []
     ts = datetime.fromisoformat(ts_iso) if ts_iso else datetime.now(UTC)
+    raw = isinstance(payload, (bytes, bytearray))
     
     # 1. Save to Postgres (The reliable log)
     sql = """
@@ -153,42 +447,26 @@ def pg_append_event(
       VALUES (%s, %s, %s, %s::jsonb, %s)
       RETURNING id;
     """
+    jsonb = Jsonb(payload, dumps=_jsonb_raw) if raw else Jsonb(payload)
     with pg_conn() as conn, conn.cursor() as cur:
-        cur.execute(sql, (ts, session_id, kind, Jsonb(payload), tags))
+        cur.execute(sql, (ts, session_id, kind, jsonb, tags))
         event_id = cur.fetchone()[0]
 
     # 2. AUTO-VECTORIZE (The "Smart" Memory)
-    # Only vectorize if it's actual text conversation
-    text_content = payload.get("text")
-    if text_content and kind in ["user_msg", "assistant_reply"]:
-        try:
-            # Generate Embedding
-            emb_resp = client.embeddings.create(
-                input=text_content,
-                model="text-embedding-3-small"
-            )
-            vector = emb_resp.data[0].embedding
-            
-            # Map kind to role
-            role = "user" if kind == "user_msg" else "assistant"
-
-            # Insert into ClickHouse Vector Table
-            c = ch_client()
-            c.insert("chat_history_vec", [[
-                str(event_id),
-                ts,
-                session_id,
-                role,
-                text_content,
-                vector
-            ]], column_names=["id", "created_at", "session_id", "role", "content", "embedding"])
-            
-            # Print to stderr for debugging (won't break MCP)
-            sys.stderr.write(f"MCP: Vectorized chat event {event_id}\n")
-            
-        except Exception as e:
-            sys.stderr.write(f"MCP: Vectorization failed (non-critical): {e}\n")
-
+    # Only vectorize if it's actual text conversation; raw payloads are
+    # parsed here and only for the kinds that embed.
+    text_content = None
+    if kind in ("user_msg", "assistant_reply"):
+        text_content = (orjson.loads(payload) if raw else payload).get("text")
+    if text_content:
+        # Map kind to role
+        role = "user" if kind == "user_msg" else "assistant"
+        # Enqueued for the chat-vector buffer: the embedding round trip
+        # and the ClickHouse insert leave the turn's critical path, and
+        # bursts coalesce into one API call plus one bulk insert.
+        _CHAT_VEC_BUFFER.add([str(event_id), ts, session_id, role, text_content, None])
+
+    _bump_write_gen()
     return {"ok": True, "event_id": str(event_id)}
 
 @mcp.tool()
@@ -197,33 +475,26 @@ def ch_search_history(query: str, limit: int = 5) -> dict[str, Any]:
     Semantic Search for CHAT HISTORY.
     Finds past conversations about a topic, even if they were weeks ago.
     """
+    if not query or not query.strip():
+        return {"results": []}
     _ensure_ch_schema()
     limit = max(1, min(20, int(limit)))
 
-    # 1. Vectorize the search query
-    response = client.embeddings.create(
-        input=query,
-        model="text-embedding-3-small"
-    )
-    query_vector = response.data[0].embedding
+    # 1. Vectorize the search query (cached for repeat queries)
+    query_vector = list(_embed(query))
 
     # 2. HNSW Search in ClickHouse
     c = ch_client()
     res = c.query(
-        """
-        SELECT created_at, role, content,
-               cosineDistance(embedding, {query_vector:Array(Float32)}) as score
-        FROM chat_history_vec
-        ORDER BY score ASC
-        LIMIT {limit:UInt32}
-        """,
+        _SQL_SEARCH_HISTORY,
         parameters={"query_vector": query_vector, "limit": limit},
+        settings={"hnsw_candidate_list_size_for_search": max(64, limit * 10)},
     )
 
     items = []
     for r in res.result_rows:
         items.append({
-            "timestamp": str(r[0]),
+            "timestamp": r[0],
             "role": r[1],
             "text": r[2],
             "score": float(r[3]),
@@ -238,6 +509,10 @@ def ch_search_history(query: str, limit: int = 5) -> dict[str, Any]:
 @mcp.tool()
 def pg_get_recent_history(session_id: str = "default", limit: int = 10) -> dict[str, Any]:
     # Standard "Short Term Memory" (Last N messages)
+    key = ("recent_history", session_id, limit, _WRITE_GEN)
+    cached = _read_cache_get(key)
+    if cached is not None:
+        return cached
     sql = """
       SELECT kind, payload 
       FROM events 
@@ -257,7 +532,9 @@ def pg_get_recent_history(session_id: str = "default", limit: int = 10) -> dict[
         else:
             history.append(f"Nexus: {text}")
             
-    return {"history": history}
+    result = {"history": history}
+    _read_cache_put(key, result)
+    return result
 
 @mcp.tool()
 def ch_insert_note(
@@ -279,45 +556,41 @@ def ch_insert_note(
     tags = tags or []
     confidence = confidence if confidence is not None else 0.8
     note_id = uuid.uuid4()
-    dl = date.fromisoformat(deadline) if deadline and deadline.strip() else date(1970, 1, 1)
-    src = uuid.UUID(source_event_id) if source_event_id else uuid.UUID(int=0)
-
-    response = client.embeddings.create(input=content, model="text-embedding-3-small")
-    embedding_vector = response.data[0].embedding
+    dl = date.fromisoformat(deadline) if deadline and deadline.strip() else _EPOCH
+    src = uuid.UUID(source_event_id) if source_event_id else _NIL_UUID
 
+    # Embedding is filled in by the insert buffer's flush, which batches
+    # one embeddings call for all rows in the flush window.
     row_data = [
-        str(note_id), datetime.now(UTC), str(src), title, content, embedding_vector,
-        dl, json.dumps(plan) if plan else "", status, int(max(0, min(255, priority))),
+        str(note_id), datetime.now(UTC), str(src), title, content, None,
+        dl, orjson.dumps(plan).decode() if plan else "", status, int(max(0, min(255, priority))),
         tags, float(confidence),
     ]
-    c = ch_client()
-    c.insert("notes_v2", [row_data], column_names=[
-        "id", "created_at", "source_event_id", "title", "content",
-        "embedding", "deadline", "plan", "status", "priority", "tags", "confidence"
-    ])
+    # Enqueued, not written: the buffer coalesces bursts of notes into
+    # one bulk insert, so the row lands within ~0.5s of the ack.
+    _NOTE_BUFFER.add(row_data)
+    _bump_write_gen()
     return {"ok": True, "note_id": str(note_id)}
 
 @mcp.tool()
 def ch_search_notes_text(query: str, limit: int = 10) -> dict[str, Any]:
+    if not query or not query.strip():
+        return {"count": 0, "items": []}
     _ensure_ch_schema()
-    response = client.embeddings.create(input=query, model="text-embedding-3-small")
-    query_vector = response.data[0].embedding
+    query_vector = list(_embed(query))
     c = ch_client()
+    # ef_search scales with the requested limit: small lookups stay
+    # fast, larger ones keep recall up.
     res = c.query(
-        """
-        SELECT id, created_at, title, content, deadline, tags, confidence,
-               cosineDistance(embedding, {query_vector:Array(Float32)}) as score
-        FROM notes_v2
-        ORDER BY score ASC
-        LIMIT {limit:UInt32}
-        """,
+        _SQL_SEARCH_NOTES,
         parameters={"query_vector": query_vector, "limit": limit},
+        settings={"hnsw_candidate_list_size_for_search": max(64, int(limit) * 10)},
     )
     items = []
     for r in res.result_rows:
         items.append({
-            "id": str(r[0]), "created_at": str(r[1]), "title": r[2], "content": r[3],
-            "deadline": str(r[4]), "tags": r[5], "confidence": float(r[6]), "score": float(r[7]),
+            "id": r[0], "created_at": r[1], "title": r[2], "content": r[3],
+            "deadline": r[4], "tags": r[5], "confidence": float(r[6]), "score": float(r[7]),
         })
     return {"count": len(items), "items": items}
 
@@ -335,6 +608,7 @@ def pg_upsert_setting(key: str, value: dict[str, Any]) -> dict[str, Any]:
 def ch_clear_notes() -> dict[str, Any]:
     c = ch_client()
     c.command("TRUNCATE TABLE notes_v2")
+    _bump_write_gen()
     return {"ok": True}
 
 
@@ -387,14 +661,9 @@ def ch_update_note(
     new_priority = priority if priority is not None else old_data["priority"]
     new_tags = tags if tags is not None else old_data["tags"]
     
-    # Re-generate embedding if content changed
-    if content:
-        response = client.embeddings.create(input=new_content, model="text-embedding-3-small")
-        embedding = response.data[0].embedding
-    else:
-        # Keep old embedding (we'd need to store it, but for now regenerate)
-        response = client.embeddings.create(input=new_content, model="text-embedding-3-small")
-        embedding = response.data[0].embedding
+    # Re-generate embedding for the (possibly unchanged) content; the
+    # cache makes the unchanged case free.
+    embedding = list(_embed(new_content))
     
     # Delete old note
     c.command(f"ALTER TABLE notes_v2 DELETE WHERE id = '{note_id}'")
@@ -410,6 +679,7 @@ def ch_update_note(
         "embedding", "deadline", "plan", "status", "priority", "tags", "confidence"
     ])
     
+    _bump_write_gen()
     return {"ok": True, "note_id": note_id}
 
 
@@ -419,6 +689,7 @@ def ch_delete_note(note_id: str) -> dict[str, Any]:
     _ensure_ch_schema()
     c = ch_client()
     c.command(f"ALTER TABLE notes_v2 DELETE WHERE id = '{note_id}'")
+    _bump_write_gen()
     return {"ok": True, "deleted_id": note_id}
 
 
@@ -449,6 +720,7 @@ def pg_delete_session_events(
         cur.execute(sql, params)
         deleted_ids = [str(row[0]) for row in cur.fetchall()]
     
+    _bump_write_gen()
     return {"ok": True, "deleted_count": len(deleted_ids)}
 
 
@@ -457,11 +729,7 @@ def ch_get_note_by_id(note_id: str) -> dict[str, Any]:
     """Get a specific note by ID."""
     _ensure_ch_schema()
     c = ch_client()
-    res = c.query(
-        "SELECT id, created_at, title, content, deadline, status, priority, tags, confidence "
-        "FROM notes_v2 WHERE id = {note_id:String} LIMIT 1",
-        parameters={"note_id": note_id}
-    )
+    res = c.query(_SQL_GET_NOTE, parameters={"note_id": note_id})
     
     if not res.result_rows:
         return {"ok": False, "error": "Note not found"}
@@ -470,11 +738,11 @@ def ch_get_note_by_id(note_id: str) -> dict[str, Any]:
     return {
         "ok": True,
         "note": {
-            "id": str(row[0]),
-            "created_at": str(row[1]),
+            "id": row[0],
+            "created_at": row[1],
             "title": row[2],
             "content": row[3],
-            "deadline": str(row[4]),
+            "deadline": row[4],
             "status": row[5],
             "priority": row[6],
             "tags": row[7],
@@ -486,28 +754,33 @@ def ch_get_note_by_id(note_id: str) -> dict[str, Any]:
 @mcp.tool()
 def ch_list_notes(limit: int = 20) -> dict[str, Any]:
     """List all notes, ordered by creation date (newest first)."""
+    key = ("list_notes", limit, _WRITE_GEN)
+    cached = _read_cache_get(key)
+    if cached is not None:
+        return cached
     _ensure_ch_schema()
     c = ch_client()
     res = c.query(
-        "SELECT id, created_at, title, content, deadline, status, priority, tags, confidence "
-        "FROM notes_v2 ORDER BY created_at DESC LIMIT {limit:UInt32}",
-        parameters={"limit": max(1, min(100, limit))}
+        _SQL_LIST_NOTES,
+        parameters={"limit": max(1, min(100, limit))},
     )
     
     notes = []
     for row in res.result_rows:
         notes.append({
-            "id": str(row[0]),
-            "created_at": str(row[1]),
+            "id": row[0],
+            "created_at": row[1],
             "title": row[2],
             "content": row[3][:100] + "..." if len(row[3]) > 100 else row[3],  # Truncate for listing
-            "deadline": str(row[4]),
+            "deadline": row[4],
             "status": row[5],
             "priority": row[6],
             "tags": row[7],
         })
     
-    return {"ok": True, "count": len(notes), "notes": notes}
+    result = {"ok": True, "count": len(notes), "notes": notes}
+    _read_cache_put(key, result)
+    return result
 
 def wait_for_databases():
     sys.stderr.write("MCP: Waiting for databases to spin up...\n")
@@ -13,8 +13,9 @@ from core.models import Result, ActionStep
 # Config
 # ----------------------------
 
-# Extra guard here too (even if safety.py already blocks)
-PROTECTED_APPS: Set[str] = {
+# Extra guard here too (even if safety.py already blocks).
+# Casefolded so the membership check can't be dodged by casing.
+PROTECTED_APPS: frozenset[str] = frozenset(s.casefold() for s in {
     "System",
     "System Settings",
     "SystemUIServer",
@@ -27,7 +28,7 @@ PROTECTED_APPS: Set[str] = {
     "Terminal",
     "iTerm2",
     "Nexus",
-}
+})
 
 CMD_TIMEOUT_SEC = 10
 
@@ -82,7 +83,7 @@ def _resolve_app_name(requested: str) -> Tuple[Optional[str], Optional[str]]:
     if not req:
         return None, "Missing app_name"
 
-    if req in PROTECTED_APPS:
+    if req.casefold() in PROTECTED_APPS:
         return None, f"Blocked: refusing to use protected app name: {req}"
     
     # Build installed apps list (lightweight scan)